@@ -1,14 +1,30 @@
 """Configuration management for YouTube Downloader."""
 
+import functools
 import json
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
 import argparse
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 
+try:
+    import orjson
 
-@dataclass
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+    _loads = json.loads
+
+
+@dataclass(slots=True)
 class DownloadConfig:
     """Configuration class for download settings."""
     output_dir: str = "./downloads"
@@ -17,11 +33,20 @@ class DownloadConfig:
     video_format: str = "mp4"
     naming_template: str = "%(playlist_index)03d - %(title)s.%(ext)s"
     concurrent_downloads: int = 3
+    # Pin worker threads to CPUs. Off by default: the affinity mask is
+    # inherited by ffmpeg subprocesses, which would throttle
+    # postprocessing to a single core
+    pin_workers: bool = False
     retry_attempts: int = 3
+    progress_update_hz: int = 10  # Max progress updates per second per download (0 = unthrottled)
     rate_limit: str = "1M"  # 1MB/s default rate limit
     embed_subs: bool = False
     embed_thumbnail: bool = True
     write_metadata: bool = True
+
+    # Multi-connection transfer settings
+    use_aria2: bool = False  # Download via aria2c with parallel range requests
+    range_connections: int = 0  # Connections per file (0 = downloader default)
     
     # Notification settings
     email_notifications: bool = False
@@ -34,6 +59,10 @@ class DownloadConfig:
     # Database settings
     use_database: bool = True
     database_path: str = "./downloads.db"
+
+    # Metadata cache settings
+    metadata_cache_ttl: int = 86400  # 24 hours
+    refresh_metadata: bool = False
     
     # Logging settings
     log_level: str = "INFO"
@@ -42,12 +71,51 @@ class DownloadConfig:
     log_backup_count: int = 5
 
 
+def _to_bool(value: str) -> bool:
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+
+# Environment variables and the config attributes they override
+_ENV_MAPPINGS = {
+    'YT_OUTPUT_DIR': 'output_dir',
+    'YT_MAX_QUALITY': 'max_quality',
+    'YT_RATE_LIMIT': 'rate_limit',
+    'YT_CONCURRENT_DOWNLOADS': 'concurrent_downloads',
+    'YT_LOG_LEVEL': 'log_level',
+    'YT_EMAIL_NOTIFICATIONS': 'email_notifications',
+    'YT_EMAIL_SERVER': 'email_smtp_server',
+    'YT_EMAIL_USERNAME': 'email_username',
+    'YT_EMAIL_PASSWORD': 'email_password',
+    'YT_EMAIL_TO': 'email_to',
+}
+
+# Converters applied to environment variable values, keyed by config attribute
+_ENV_CONVERTERS = {
+    'concurrent_downloads': int,
+    'email_smtp_port': int,
+    'log_max_size': int,
+    'log_backup_count': int,
+    'email_notifications': _to_bool,
+    'pin_workers': _to_bool,
+    'embed_subs': _to_bool,
+    'embed_thumbnail': _to_bool,
+    'write_metadata': _to_bool,
+    'use_database': _to_bool,
+}
+
+
+def config_to_dict(config: DownloadConfig) -> Dict[str, Any]:
+    """Convert a DownloadConfig to a plain dictionary."""
+    return {f.name: getattr(config, f.name) for f in fields(config)}
+
+
 class ConfigManager:
     """Manages configuration from multiple sources."""
     
     def __init__(self, config_file: str = "config.json"):
         self.config_file = Path(config_file)
         self.config = DownloadConfig()
+        self._file_state = None  # (st_mtime_ns, st_size) of the last parse
         
     def load_config(self) -> DownloadConfig:
         """Load configuration from file, environment, and command line."""
@@ -63,56 +131,51 @@ class ConfigManager:
     def _load_from_file(self):
         """Load configuration from JSON file."""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                
+            # Skip the read and parse entirely when the file is unchanged
+            stat = self.config_file.stat()
+            file_state = (stat.st_mtime_ns, stat.st_size)
+            if file_state == self._file_state:
+                return
+
+            with open(self.config_file, 'rb') as f:
+                config_data = _loads(f.read())
+
             # Update config with file values
             for key, value in config_data.items():
                 if hasattr(self.config, key):
                     setattr(self.config, key, value)
-        except (json.JSONDecodeError, FileNotFoundError) as e:
+
+            self._file_state = file_state
+        except (ValueError, FileNotFoundError) as e:
             print(f"Warning: Could not load config file {self.config_file}: {e}")
     
     def _load_from_env(self):
         """Load configuration from environment variables."""
-        env_mappings = {
-            'YT_OUTPUT_DIR': 'output_dir',
-            'YT_MAX_QUALITY': 'max_quality',
-            'YT_RATE_LIMIT': 'rate_limit',
-            'YT_CONCURRENT_DOWNLOADS': 'concurrent_downloads',
-            'YT_LOG_LEVEL': 'log_level',
-            'YT_EMAIL_NOTIFICATIONS': 'email_notifications',
-            'YT_EMAIL_SERVER': 'email_smtp_server',
-            'YT_EMAIL_USERNAME': 'email_username',
-            'YT_EMAIL_PASSWORD': 'email_password',
-            'YT_EMAIL_TO': 'email_to',
-        }
-        
-        for env_var, config_attr in env_mappings.items():
+        for env_var, config_attr in _ENV_MAPPINGS.items():
             env_value = os.getenv(env_var)
             if env_value:
                 # Convert string values to appropriate types
-                if config_attr in ['concurrent_downloads', 'email_smtp_port', 'log_max_size', 'log_backup_count']:
-                    env_value = int(env_value)
-                elif config_attr in ['email_notifications', 'embed_subs', 'embed_thumbnail', 'write_metadata', 'use_database']:
-                    env_value = env_value.lower() in ('true', '1', 'yes', 'on')
-                
+                converter = _ENV_CONVERTERS.get(config_attr)
+                if converter:
+                    env_value = converter(env_value)
+
                 setattr(self.config, config_attr, env_value)
     
     def save_config(self):
         """Save current configuration to file."""
-        config_dict = asdict(self.config)
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(config_dict, f, indent=2)
-    
+        config_dict = config_to_dict(self.config)
+        with open(self.config_file, 'wb') as f:
+            f.write(_dumps(config_dict))
+
     def create_sample_config(self):
         """Create a sample configuration file."""
-        sample_config = asdict(DownloadConfig())
-        with open('config.sample.json', 'w', encoding='utf-8') as f:
-            json.dump(sample_config, f, indent=2)
+        sample_config = config_to_dict(DownloadConfig())
+        with open('config.sample.json', 'wb') as f:
+            f.write(_dumps(sample_config))
         print("Sample configuration created: config.sample.json")
 
 
+@functools.lru_cache(maxsize=1)
 def setup_argument_parser() -> argparse.ArgumentParser:
     """Set up command line argument parser."""
     parser = argparse.ArgumentParser(
@@ -136,7 +199,7 @@ Examples:
     parser.add_argument('--format', '-f', choices=['mp4', 'mkv', 'webm'],
                        help='Output video format')
     parser.add_argument('--concurrent', '-j', type=int,
-                       help='Number of concurrent downloads')
+                       help='Number of concurrent downloads (0 = auto-tune)')
     parser.add_argument('--rate-limit', '-r',
                        help='Download rate limit (e.g., 1M, 500K)')
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
@@ -147,6 +210,8 @@ Examples:
                        help='Create sample configuration file and exit')
     parser.add_argument('--resume', action='store_true',
                        help='Resume interrupted downloads')
+    parser.add_argument('--refresh-metadata', action='store_true',
+                       help='Ignore cached playlist metadata and re-fetch')
     parser.add_argument('--list-formats', action='store_true',
                        help='List available formats for the playlist')
     
@@ -161,7 +226,7 @@ def merge_args_with_config(config: DownloadConfig, args: argparse.Namespace) ->
         config.max_quality = args.quality
     if args.format:
         config.video_format = args.format
-    if args.concurrent:
+    if args.concurrent is not None:  # 0 is a valid value (auto-tune)
         config.concurrent_downloads = args.concurrent
     if args.rate_limit:
         config.rate_limit = args.rate_limit
@@ -169,5 +234,7 @@ def merge_args_with_config(config: DownloadConfig, args: argparse.Namespace) ->
         config.log_level = args.log_level
     if args.no_database:
         config.use_database = False
+    if args.refresh_metadata:
+        config.refresh_metadata = True
         
     return config
\ No newline at end of file
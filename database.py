@@ -6,13 +6,14 @@ import hashlib
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass, asdict
 import logging
+import threading
 from contextlib import contextmanager
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadRecord:
     """Database record for a download."""
     id: str
@@ -36,6 +37,89 @@ class DownloadRecord:
         if self.created_at == 0:
             self.created_at = time.time()
 
+    @classmethod
+    def from_row(cls, row) -> "DownloadRecord":
+        """Build a record positionally from a row in field order.
+
+        Avoids the temporary dict and keyword binding of cls(**dict(row));
+        queries must select _DOWNLOAD_COLUMNS so the order is stable.
+        """
+        return cls(*row)
+
+
+# Serialized empty metadata, shared so no-op metadata skips the encoder
+_EMPTY_JSON = "{}"
+
+# Explicit column list matching DownloadRecord field order, so rows can be
+# bound positionally instead of via dict unpacking
+_DOWNLOAD_COLUMNS = (
+    "id, playlist_url, video_url, video_id, title, filename, status, "
+    "file_size, downloaded_bytes, quality, format, error_message, "
+    "created_at, started_at, completed_at, metadata"
+)
+
+# Rows pulled per lock acquisition by the streaming readers
+_STREAM_BATCH = 500
+
+# SQL kept as module-level constants so statement text is stable and
+# SQLite's per-connection statement cache can reuse prepared plans.
+_SQL_ADD_DOWNLOAD = """
+    INSERT OR REPLACE INTO downloads
+    (id, playlist_url, video_url, video_id, title, filename, status,
+     file_size, downloaded_bytes, quality, format, error_message,
+     created_at, started_at, completed_at, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_IS_VIDEO_DOWNLOADED = """
+    SELECT 1 FROM downloads
+    WHERE playlist_url = ? AND video_id = ? AND status = 'completed'
+    LIMIT 1
+"""
+
+_SQL_FLUSH_PROGRESS = """
+    UPDATE downloads
+    SET status = 'downloading', downloaded_bytes = ?, started_at = ?
+    WHERE id = ?
+"""
+
+# One pre-built statement per status transition so SQLite reuses the same
+# prepared plan instead of re-parsing a freshly joined SQL string
+_SQL_UPDATE_STATUS = {
+    'completed': "UPDATE downloads SET status = 'completed', completed_at = ? WHERE id = ?",
+    'failed': "UPDATE downloads SET status = 'failed', error_message = ? WHERE id = ?",
+}
+_SQL_UPDATE_STATUS_GENERIC = "UPDATE downloads SET status = ? WHERE id = ?"
+
+_SQL_UPSERT_TASK = """
+    INSERT INTO extension_tasks
+    (id, url, type, status, progress, error_message, created_at_ns, updated_at_ns)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        status = excluded.status,
+        progress = excluded.progress,
+        error_message = excluded.error_message,
+        updated_at_ns = excluded.updated_at_ns
+"""
+
+_SQL_DELETE_STALE_TASKS = """
+    DELETE FROM extension_tasks
+    WHERE status IN ('completed', 'failed') AND updated_at_ns < ?
+"""
+
+# Per-status breakdown plus overall totals in one round-trip; the totals
+# row is marked by a NULL status
+_SQL_DOWNLOAD_STATISTICS = """
+    SELECT status, COUNT(*), 0, COALESCE(SUM(file_size), 0), NULL
+    FROM downloads
+    GROUP BY status
+    UNION ALL
+    SELECT NULL, COUNT(*), COUNT(DISTINCT playlist_url), COALESCE(SUM(file_size), 0),
+           AVG(CASE WHEN completed_at IS NOT NULL AND started_at IS NOT NULL
+               THEN completed_at - started_at END)
+    FROM downloads
+"""
+
 
 class DownloadDatabase:
     """SQLite database for tracking downloads."""
@@ -44,6 +128,26 @@ class DownloadDatabase:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.logger = logging.getLogger(__name__)
+
+        # Single long-lived connection shared across threads; per-call
+        # connects would pay setup and journal replay on every query.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                     cached_statements=256)
+        # Default tuple rows: lighter than sqlite3.Row and the hot read
+        # paths bind positionally anyway
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-20000")
+        self._lock = threading.RLock()
+
+        # Coalescing buffer for progress updates: last write wins per id,
+        # flushed in one transaction instead of one commit per tick.
+        self._pending_progress: Dict[str, Tuple[int, float]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_interval = 0.5  # seconds
+
         self._init_database()
     
     def _init_database(self):
@@ -87,6 +191,21 @@ class DownloadDatabase:
                 )
             """)
             
+            # Extension API task state, persisted so server restarts do
+            # not lose task history
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS extension_tasks (
+                    id TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    progress REAL DEFAULT 0,
+                    error_message TEXT DEFAULT '',
+                    created_at_ns INTEGER NOT NULL,
+                    updated_at_ns INTEGER NOT NULL
+                )
+            """)
+            
             # Download sessions table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS download_sessions (
@@ -108,40 +227,57 @@ class DownloadDatabase:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_downloads_playlist ON downloads(playlist_url)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_downloads_video_id ON downloads(video_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_status ON download_sessions(status)")
+            # Covering index so is_video_downloaded is answered from the
+            # index alone, plus (playlist_url, status) for the list queries
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_downloads_lookup ON downloads(playlist_url, video_id, status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_downloads_playlist_status ON downloads(playlist_url, status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ext_tasks_status ON extension_tasks(status, updated_at_ns)")
             
             conn.commit()
             self.logger.info("Database initialized successfully")
     
     @contextmanager
     def get_connection(self):
-        """Get a database connection with proper error handling."""
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable column access by name
-            yield conn
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            self.logger.error(f"Database error: {e}")
-            raise
-        finally:
-            if conn:
-                conn.close()
+        """Get the shared database connection with proper error handling."""
+        with self._lock:
+            try:
+                yield self._conn
+            except Exception as e:
+                self._conn.rollback()
+                self.logger.error(f"Database error: {e}")
+                raise
+
+    def close(self):
+        """Flush pending updates and close the shared database connection."""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        self._flush_progress()
+        with self._lock:
+            self._conn.close()
     
     def add_playlist(self, url: str, title: str, description: str = "", video_count: int = 0, 
                     metadata: Dict[str, Any] = None) -> bool:
         """Add or update a playlist in the database."""
         try:
+            now = time.time()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    INSERT OR REPLACE INTO playlists 
+                    INSERT INTO playlists
                     (url, title, description, video_count, created_at, last_updated, metadata)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        title = excluded.title,
+                        description = excluded.description,
+                        video_count = excluded.video_count,
+                        last_updated = excluded.last_updated,
+                        metadata = excluded.metadata
                 """, (
-                    url, title, description, video_count, 
-                    time.time(), time.time(), json.dumps(metadata or {})
+                    url, title, description, video_count,
+                    now, now,
+                    json.dumps(metadata, separators=(',', ':')) if metadata else _EMPTY_JSON
                 ))
                 conn.commit()
                 return True
@@ -154,13 +290,7 @@ class DownloadDatabase:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO downloads 
-                    (id, playlist_url, video_url, video_id, title, filename, status, 
-                     file_size, downloaded_bytes, quality, format, error_message,
-                     created_at, started_at, completed_at, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                cursor.execute(_SQL_ADD_DOWNLOAD, (
                     record.id, record.playlist_url, record.video_url, record.video_id,
                     record.title, record.filename, record.status, record.file_size,
                     record.downloaded_bytes, record.quality, record.format,
@@ -173,118 +303,248 @@ class DownloadDatabase:
             self.logger.error(f"Failed to add download record: {e}")
             return False
     
-    def update_download_status(self, download_id: str, status: str, 
+    def add_downloads_bulk(self, records: List[DownloadRecord]) -> bool:
+        """Add many download records in a single transaction.
+
+        One commit (one fsync) covers the whole playlist enumeration
+        instead of one per record.
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(_SQL_ADD_DOWNLOAD, (
+                    (record.id, record.playlist_url, record.video_url,
+                     record.video_id, record.title, record.filename,
+                     record.status, record.file_size, record.downloaded_bytes,
+                     record.quality, record.format, record.error_message,
+                     record.created_at, record.started_at,
+                     record.completed_at, record.metadata)
+                    for record in records
+                ))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"Failed to add download records: {e}")
+            return False
+
+    def update_download_status(self, download_id: str, status: str,
                              downloaded_bytes: int = None, error_message: str = None) -> bool:
-        """Update the status of a download."""
+        """Update the status of a download.
+
+        Progress ('downloading') updates are coalesced per download and
+        flushed in batches; terminal statuses are written through immediately.
+        """
+        now = time.time()
+
+        if status == "downloading" and downloaded_bytes is not None:
+            with self._pending_lock:
+                self._pending_progress[download_id] = (downloaded_bytes, now)
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self._flush_interval, self._flush_progress)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+            return True
+
+        # Terminal statuses bypass the buffer; drop any stale progress first
+        with self._pending_lock:
+            self._pending_progress.pop(download_id, None)
+
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                updates = ["status = ?"]
-                params = [status]
-                
-                if status == "downloading" and downloaded_bytes is not None:
-                    updates.append("downloaded_bytes = ?")
-                    updates.append("started_at = ?")
-                    params.extend([downloaded_bytes, time.time()])
-                elif status == "completed":
-                    updates.append("completed_at = ?")
-                    params.append(time.time())
+
+                if status == "completed":
+                    cursor.execute(_SQL_UPDATE_STATUS['completed'], (now, download_id))
                 elif status == "failed" and error_message:
-                    updates.append("error_message = ?")
-                    params.append(error_message)
-                
-                params.append(download_id)
-                
-                cursor.execute(f"""
-                    UPDATE downloads 
-                    SET {', '.join(updates)}
-                    WHERE id = ?
-                """, params)
-                
+                    cursor.execute(_SQL_UPDATE_STATUS['failed'], (error_message, download_id))
+                else:
+                    cursor.execute(_SQL_UPDATE_STATUS_GENERIC, (status, download_id))
+
                 conn.commit()
                 return cursor.rowcount > 0
         except Exception as e:
             self.logger.error(f"Failed to update download status: {e}")
             return False
+
+    def _flush_progress(self):
+        """Flush buffered progress updates in a single transaction."""
+        with self._pending_lock:
+            self._flush_timer = None
+            if not self._pending_progress:
+                return
+            rows = [(downloaded_bytes, started_at, download_id)
+                    for download_id, (downloaded_bytes, started_at)
+                    in self._pending_progress.items()]
+            self._pending_progress.clear()
+
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(_SQL_FLUSH_PROGRESS, rows)
+                conn.commit()
+        except Exception as e:
+            self.logger.error(f"Failed to flush progress updates: {e}")
     
     def get_download(self, download_id: str) -> Optional[DownloadRecord]:
         """Get a download record by ID."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM downloads WHERE id = ?", (download_id,))
+                cursor.execute(f"SELECT {_DOWNLOAD_COLUMNS} FROM downloads WHERE id = ?", (download_id,))
                 row = cursor.fetchone()
                 
                 if row:
-                    return DownloadRecord(**dict(row))
+                    return DownloadRecord.from_row(row)
                 return None
         except Exception as e:
             self.logger.error(f"Failed to get download record: {e}")
             return None
     
-    def get_downloads_by_playlist(self, playlist_url: str, status: str = None) -> List[DownloadRecord]:
-        """Get all downloads for a playlist, optionally filtered by status."""
+    def get_downloads_by_playlist(self, playlist_url: str, status: str = None) -> Iterator[DownloadRecord]:
+        """Yield downloads for a playlist, optionally filtered by status.
+
+        Rows are streamed in batches so large playlists never get
+        materialized twice, and the shared connection lock is released
+        between batches rather than held from first yield to exhaustion
+        (which would block writers while the caller processes records);
+        callers that need a list should wrap in list().
+        """
+        cursor = None
+        while True:
+            try:
+                with self.get_connection() as conn:
+                    if cursor is None:
+                        cursor = conn.cursor()
+                        if status:
+                            cursor.execute(
+                                f"SELECT {_DOWNLOAD_COLUMNS} FROM downloads WHERE playlist_url = ? AND status = ? ORDER BY created_at",
+                                (playlist_url, status)
+                            )
+                        else:
+                            cursor.execute(
+                                f"SELECT {_DOWNLOAD_COLUMNS} FROM downloads WHERE playlist_url = ? ORDER BY created_at",
+                                (playlist_url,)
+                            )
+                    rows = cursor.fetchmany(_STREAM_BATCH)
+            except Exception as e:
+                self.logger.error(f"Failed to get downloads for playlist: {e}")
+                return
+
+            if not rows:
+                return
+            for row in rows:
+                yield DownloadRecord.from_row(row)
+
+    def get_incomplete_downloads(self, playlist_url: str = None) -> Iterator[DownloadRecord]:
+        """Yield incomplete downloads (pending, downloading, failed).
+
+        Batched like get_downloads_by_playlist so the connection lock is
+        never held while the caller consumes a yielded record.
+        """
+        cursor = None
+        while True:
+            try:
+                with self.get_connection() as conn:
+                    if cursor is None:
+                        cursor = conn.cursor()
+                        if playlist_url:
+                            cursor.execute(f"""
+                                SELECT {_DOWNLOAD_COLUMNS} FROM downloads
+                                WHERE playlist_url = ? AND status IN ('pending', 'downloading', 'failed')
+                                ORDER BY created_at
+                            """, (playlist_url,))
+                        else:
+                            cursor.execute(f"""
+                                SELECT {_DOWNLOAD_COLUMNS} FROM downloads
+                                WHERE status IN ('pending', 'downloading', 'failed')
+                                ORDER BY created_at
+                            """)
+                    rows = cursor.fetchmany(_STREAM_BATCH)
+            except Exception as e:
+                self.logger.error(f"Failed to get incomplete downloads: {e}")
+                return
+
+            if not rows:
+                return
+            for row in rows:
+                yield DownloadRecord.from_row(row)
+    
+    def is_video_downloaded(self, playlist_url: str, video_id: str) -> bool:
+        """Check if a video is already downloaded successfully."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.execute(_SQL_IS_VIDEO_DOWNLOADED, (playlist_url, video_id))
                 
-                if status:
-                    cursor.execute(
-                        "SELECT * FROM downloads WHERE playlist_url = ? AND status = ? ORDER BY created_at",
-                        (playlist_url, status)
-                    )
-                else:
-                    cursor.execute(
-                        "SELECT * FROM downloads WHERE playlist_url = ? ORDER BY created_at",
-                        (playlist_url,)
-                    )
-                
-                return [DownloadRecord(**dict(row)) for row in cursor.fetchall()]
+                return cursor.fetchone() is not None
         except Exception as e:
-            self.logger.error(f"Failed to get downloads for playlist: {e}")
-            return []
+            self.logger.error(f"Failed to check video download status: {e}")
+            return False
     
-    def get_incomplete_downloads(self, playlist_url: str = None) -> List[DownloadRecord]:
-        """Get all incomplete downloads (pending, downloading, failed)."""
+    def load_completed_set(self, playlist_url: str) -> Set[str]:
+        """Load all completed video IDs for a playlist in one query.
+
+        Lets callers answer repeated is-downloaded checks with a set
+        lookup instead of one SQL round-trip per video.
+        """
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                if playlist_url:
-                    cursor.execute("""
-                        SELECT * FROM downloads 
-                        WHERE playlist_url = ? AND status IN ('pending', 'downloading', 'failed')
-                        ORDER BY created_at
-                    """, (playlist_url,))
-                else:
-                    cursor.execute("""
-                        SELECT * FROM downloads 
-                        WHERE status IN ('pending', 'downloading', 'failed')
-                        ORDER BY created_at
-                    """)
-                
-                return [DownloadRecord(**dict(row)) for row in cursor.fetchall()]
+                cursor.execute(
+                    "SELECT video_id FROM downloads WHERE playlist_url = ? AND status = 'completed'",
+                    (playlist_url,)
+                )
+                return {row[0] for row in cursor.fetchall()}
         except Exception as e:
-            self.logger.error(f"Failed to get incomplete downloads: {e}")
-            return []
-    
-    def is_video_downloaded(self, playlist_url: str, video_id: str) -> bool:
-        """Check if a video is already downloaded successfully."""
+            self.logger.error(f"Failed to load completed video set: {e}")
+            return set()
+
+    def upsert_task(self, task_id: str, url: str, task_type: str, status: str,
+                    progress: float = 0.0, error_message: str = "",
+                    created_at_ns: int = 0, updated_at_ns: int = 0) -> bool:
+        """Insert or update an extension API task."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 1 FROM downloads 
-                    WHERE playlist_url = ? AND video_id = ? AND status = 'completed'
-                """, (playlist_url, video_id))
-                
-                return cursor.fetchone() is not None
+                cursor.execute(_SQL_UPSERT_TASK, (
+                    task_id, url, task_type, status, progress,
+                    error_message, created_at_ns, updated_at_ns
+                ))
+                conn.commit()
+                return True
         except Exception as e:
-            self.logger.error(f"Failed to check video download status: {e}")
+            self.logger.error(f"Failed to upsert task {task_id}: {e}")
             return False
-    
-    def create_download_session(self, playlist_url: str, total_videos: int, 
+
+    def get_tasks(self) -> List[tuple]:
+        """Load all persisted extension tasks.
+
+        Rows come back in upsert_task's column order so callers can
+        unpack them positionally.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT id, url, type, status, progress, error_message,"
+                    " created_at_ns, updated_at_ns FROM extension_tasks"
+                )
+                return cursor.fetchall()
+        except Exception as e:
+            self.logger.error(f"Failed to load extension tasks: {e}")
+            return []
+
+    def delete_stale_tasks(self, cutoff_ns: int) -> int:
+        """Delete finished extension tasks last updated before cutoff_ns."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_DELETE_STALE_TASKS, (cutoff_ns,))
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            self.logger.error(f"Failed to delete stale tasks: {e}")
+            return 0
+
+    def create_download_session(self, playlist_url: str, total_videos: int,
                               config: Dict[str, Any] = None) -> str:
         """Create a new download session."""
         session_id = self._generate_session_id(playlist_url)
@@ -298,7 +558,7 @@ class DownloadDatabase:
                     VALUES (?, ?, ?, 'active', ?, ?)
                 """, (
                     session_id, playlist_url, time.time(), total_videos,
-                    json.dumps(config or {})
+                    json.dumps(config, separators=(',', ':')) if config else _EMPTY_JSON
                 ))
                 conn.commit()
                 return session_id
@@ -357,7 +617,8 @@ class DownloadDatabase:
                 row = cursor.fetchone()
                 
                 if row:
-                    return dict(row)
+                    columns = [col[0] for col in cursor.description]
+                    return dict(zip(columns, row))
                 return None
         except Exception as e:
             self.logger.error(f"Failed to get session stats: {e}")
@@ -389,28 +650,21 @@ class DownloadDatabase:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Count downloads by status
-                cursor.execute("""
-                    SELECT status, COUNT(*), SUM(file_size) as total_size
-                    FROM downloads 
-                    GROUP BY status
-                """)
-                status_counts = {row[0]: {'count': row[1], 'total_size': row[2] or 0} 
-                               for row in cursor.fetchall()}
-                
-                # Get total statistics
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as total_downloads,
-                        COUNT(DISTINCT playlist_url) as total_playlists,
-                        SUM(file_size) as total_size,
-                        AVG(CASE WHEN completed_at IS NOT NULL AND started_at IS NOT NULL 
-                            THEN completed_at - started_at END) as avg_download_time
-                    FROM downloads
-                """)
-                totals = dict(cursor.fetchone())
-                
+                cursor.execute(_SQL_DOWNLOAD_STATISTICS)
+
+                status_counts = {}
+                totals = {}
+                for status, count, playlists, total_size, avg_time in cursor.fetchall():
+                    if status is None:
+                        totals = {
+                            'total_downloads': count,
+                            'total_playlists': playlists,
+                            'total_size': total_size,
+                            'avg_download_time': avg_time
+                        }
+                    else:
+                        status_counts[status] = {'count': count, 'total_size': total_size}
+
                 return {
                     'status_breakdown': status_counts,
                     'totals': totals,
@@ -424,11 +678,11 @@ class DownloadDatabase:
     def _generate_session_id(self, playlist_url: str) -> str:
         """Generate a unique session ID."""
         timestamp = str(time.time())
-        return hashlib.md5(f"{playlist_url}{timestamp}".encode()).hexdigest()[:12]
-    
+        return hashlib.blake2b(f"{playlist_url}{timestamp}".encode(), digest_size=6).hexdigest()
+
     def _generate_download_id(self, playlist_url: str, video_id: str) -> str:
         """Generate a unique download ID."""
-        return hashlib.md5(f"{playlist_url}:{video_id}".encode()).hexdigest()[:16]
+        return hashlib.blake2b(f"{playlist_url}:{video_id}".encode(), digest_size=8).hexdigest()
 
 
 class ResumeManager:
@@ -437,17 +691,34 @@ class ResumeManager:
     def __init__(self, database: DownloadDatabase):
         self.db = database
         self.logger = logging.getLogger(__name__)
-    
+        self._completed_cache: Dict[str, Set[str]] = {}
+
+    def is_downloaded(self, playlist_url: str, video_id: str) -> bool:
+        """Check completion against a cached per-playlist set.
+
+        The set is loaded with a single bulk query on first use; new
+        completions should be recorded via mark_downloaded.
+        """
+        completed = self._completed_cache.get(playlist_url)
+        if completed is None:
+            completed = self.db.load_completed_set(playlist_url)
+            self._completed_cache[playlist_url] = completed
+        return video_id in completed
+
+    def mark_downloaded(self, playlist_url: str, video_id: str):
+        """Record a newly completed video in the cached set."""
+        if playlist_url in self._completed_cache:
+            self._completed_cache[playlist_url].add(video_id)
+
     def can_resume_playlist(self, playlist_url: str) -> bool:
         """Check if a playlist download can be resumed."""
-        incomplete_downloads = self.db.get_incomplete_downloads(playlist_url)
-        return len(incomplete_downloads) > 0
-    
+        return next(self.db.get_incomplete_downloads(playlist_url), None) is not None
+
     def get_resume_info(self, playlist_url: str) -> Dict[str, Any]:
         """Get information about resumable downloads."""
-        incomplete = self.db.get_incomplete_downloads(playlist_url)
-        completed = self.db.get_downloads_by_playlist(playlist_url, "completed")
-        failed = self.db.get_downloads_by_playlist(playlist_url, "failed")
+        incomplete = list(self.db.get_incomplete_downloads(playlist_url))
+        completed = list(self.db.get_downloads_by_playlist(playlist_url, "completed"))
+        failed = list(self.db.get_downloads_by_playlist(playlist_url, "failed"))
         
         return {
             'playlist_url': playlist_url,
@@ -461,15 +732,15 @@ class ResumeManager:
     
     def prepare_resume_list(self, playlist_url: str) -> List[str]:
         """Prepare a list of video URLs to resume downloading."""
-        incomplete_downloads = self.db.get_incomplete_downloads(playlist_url)
-        
+        video_urls = []
+
         # Reset 'downloading' status to 'pending' for stuck downloads
-        for download in incomplete_downloads:
+        for download in self.db.get_incomplete_downloads(playlist_url):
             if download.status == 'downloading':
                 self.db.update_download_status(download.id, 'pending')
-        
-        # Return list of video URLs to download
-        return [download.video_url for download in incomplete_downloads]
+            video_urls.append(download.video_url)
+
+        return video_urls
     
     def mark_for_retry(self, playlist_url: str, video_ids: List[str] = None):
         """Mark failed downloads for retry."""
@@ -478,12 +749,19 @@ class ResumeManager:
                 cursor = conn.cursor()
                 
                 if video_ids:
-                    placeholders = ','.join(['?' for _ in video_ids])
-                    cursor.execute(f"""
-                        UPDATE downloads 
+                    # Stage IDs in a temp table: keeps the UPDATE text stable
+                    # for the statement cache and avoids the bound-variable
+                    # limit on large ID lists
+                    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS retry_ids (id TEXT PRIMARY KEY)")
+                    cursor.execute("DELETE FROM retry_ids")
+                    cursor.executemany("INSERT INTO retry_ids VALUES (?)",
+                                       ((video_id,) for video_id in video_ids))
+                    cursor.execute("""
+                        UPDATE downloads
                         SET status = 'pending', error_message = '', started_at = NULL
-                        WHERE playlist_url = ? AND video_id IN ({placeholders}) AND status = 'failed'
-                    """, [playlist_url] + video_ids)
+                        WHERE playlist_url = ? AND status = 'failed'
+                          AND video_id IN (SELECT id FROM retry_ids)
+                    """, (playlist_url,))
                 else:
                     cursor.execute("""
                         UPDATE downloads 
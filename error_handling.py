@@ -1,9 +1,11 @@
 """Error handling and retry logic for YouTube Downloader."""
 
+import re
+import threading
 import time
 import random
-from typing import Callable, Any, Optional, Type, Tuple
-from functools import wraps
+from typing import Callable, Any, Dict, Optional, Type, Tuple
+from functools import lru_cache, wraps
 from enum import Enum
 import logging
 from dataclasses import dataclass
@@ -20,7 +22,7 @@ class ErrorType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class RetryConfig:
     """Configuration for retry behavior."""
     max_attempts: int = 3
@@ -37,7 +39,11 @@ class RetryConfig:
 
 class DownloadError(Exception):
     """Base exception for download-related errors."""
-    
+
+    # Exception subclasses keep a lazy __dict__, but slots still give
+    # fixed-offset storage for the hot attributes
+    __slots__ = ('error_type', 'url', 'original_error', 'timestamp')
+
     def __init__(self, message: str, error_type: ErrorType = ErrorType.UNKNOWN, 
                  url: Optional[str] = None, original_error: Optional[Exception] = None):
         super().__init__(message)
@@ -49,113 +55,173 @@ class DownloadError(Exception):
 
 class NetworkError(DownloadError):
     """Network-related download error."""
-    
+
+    __slots__ = ()
+
     def __init__(self, message: str, url: Optional[str] = None, original_error: Optional[Exception] = None):
         super().__init__(message, ErrorType.NETWORK_ERROR, url, original_error)
 
 
 class QuotaExceededError(DownloadError):
     """API quota exceeded error."""
-    
+
+    __slots__ = ()
+
     def __init__(self, message: str, url: Optional[str] = None, original_error: Optional[Exception] = None):
         super().__init__(message, ErrorType.QUOTA_EXCEEDED, url, original_error)
 
 
 class VideoUnavailableError(DownloadError):
     """Video is not available for download."""
-    
+
+    __slots__ = ()
+
     def __init__(self, message: str, url: Optional[str] = None, original_error: Optional[Exception] = None):
         super().__init__(message, ErrorType.VIDEO_UNAVAILABLE, url, original_error)
 
 
 class PermissionError(DownloadError):
     """Permission-related error."""
-    
+
+    __slots__ = ()
+
     def __init__(self, message: str, url: Optional[str] = None, original_error: Optional[Exception] = None):
         super().__init__(message, ErrorType.PERMISSION_ERROR, url, original_error)
 
 
 class DiskFullError(DownloadError):
     """Disk space insufficient error."""
-    
+
+    __slots__ = ()
+
     def __init__(self, message: str, url: Optional[str] = None, original_error: Optional[Exception] = None):
         super().__init__(message, ErrorType.DISK_FULL, url, original_error)
 
 
 class FormatError(DownloadError):
     """Video format not available error."""
-    
+
+    __slots__ = ()
+
     def __init__(self, message: str, url: Optional[str] = None, original_error: Optional[Exception] = None):
         super().__init__(message, ErrorType.FORMAT_ERROR, url, original_error)
 
 
+# Keyword -> exception class table for error classification, compiled into a
+# single case-insensitive alternation so one regex pass replaces dozens of
+# Python-level substring scans per message
+_KEYWORD_TABLE = {
+    # Network-related errors
+    'network': NetworkError,
+    'connection': NetworkError,
+    'timeout': NetworkError,
+    'unreachable': NetworkError,
+    'http error 5': NetworkError,
+    'temporary failure': NetworkError,
+    'unable to connect': NetworkError,
+    'connection refused': NetworkError,
+    # Quota/Rate limiting
+    'quota exceeded': QuotaExceededError,
+    'rate limit': QuotaExceededError,
+    'too many requests': QuotaExceededError,
+    'http error 429': QuotaExceededError,
+    # Video unavailable
+    'video unavailable': VideoUnavailableError,
+    'private video': VideoUnavailableError,
+    'deleted': VideoUnavailableError,
+    'not available': VideoUnavailableError,
+    'blocked in your country': VideoUnavailableError,
+    'age-restricted': VideoUnavailableError,
+    'http error 404': VideoUnavailableError,
+    # Permission errors
+    'permission denied': PermissionError,
+    'access denied': PermissionError,
+    'forbidden': PermissionError,
+    'http error 403': PermissionError,
+    # Disk space errors
+    'no space left': DiskFullError,
+    'disk full': DiskFullError,
+    'insufficient space': DiskFullError,
+    # Format errors
+    'no video formats found': FormatError,
+    'format not available': FormatError,
+    'unsupported format': FormatError,
+}
+
+# Longer keywords first so e.g. 'connection refused' wins over 'connection'
+_KEYWORD_RE = re.compile(
+    '|'.join(re.escape(keyword)
+             for keyword in sorted(_KEYWORD_TABLE, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+# Category priority follows the table's declaration order: when a message
+# matches keywords from several categories ("This video is not available
+# due to connection timeout"), the earliest-declared class wins — the same
+# order the sequential substring checks used to apply, so ambiguous
+# messages stay retryable NetworkErrors rather than whatever keyword
+# happens to appear first in the text
+_CLASS_PRIORITY: Dict[Type[DownloadError], int] = {}
+for _cls in _KEYWORD_TABLE.values():
+    _CLASS_PRIORITY.setdefault(_cls, len(_CLASS_PRIORITY))
+
+
+@lru_cache(maxsize=1024)
+def _classify_type(error_msg: str) -> Type[DownloadError]:
+    """Map an error message to its exception class.
+
+    yt-dlp repeats the same handful of error strings across a playlist,
+    so the class lookup is memoized; only the class is cached, never the
+    exception instance (which carries per-call url and timestamp). All
+    keyword hits are collected in one regex pass and the tie is broken
+    by category priority, not by position in the message. The regex is
+    case-insensitive, so only the matched keywords (not the whole
+    message) need lowercasing for the table lookup.
+    """
+    matches = _KEYWORD_RE.findall(error_msg)
+    if matches:
+        return min((_KEYWORD_TABLE[m.lower()] for m in matches),
+                   key=_CLASS_PRIORITY.__getitem__)
+    return DownloadError
+
+
 class ErrorClassifier:
     """Classifies errors from yt-dlp and other sources."""
-    
+
     @staticmethod
     def classify_ytdlp_error(error_msg: str, url: str = "") -> DownloadError:
         """Classify a yt-dlp error message into appropriate exception type."""
-        error_msg_lower = error_msg.lower()
-        
-        # Network-related errors
-        if any(keyword in error_msg_lower for keyword in [
-            'network', 'connection', 'timeout', 'unreachable', 'http error 5',
-            'temporary failure', 'unable to connect', 'connection refused'
-        ]):
-            return NetworkError(error_msg, url)
-        
-        # Quota/Rate limiting
-        if any(keyword in error_msg_lower for keyword in [
-            'quota exceeded', 'rate limit', 'too many requests', 'http error 429'
-        ]):
-            return QuotaExceededError(error_msg, url)
-        
-        # Video unavailable
-        if any(keyword in error_msg_lower for keyword in [
-            'video unavailable', 'private video', 'deleted', 'not available',
-            'blocked in your country', 'age-restricted', 'http error 404'
-        ]):
-            return VideoUnavailableError(error_msg, url)
-        
-        # Permission errors
-        if any(keyword in error_msg_lower for keyword in [
-            'permission denied', 'access denied', 'forbidden', 'http error 403'
-        ]):
-            return PermissionError(error_msg, url)
-        
-        # Disk space errors
-        if any(keyword in error_msg_lower for keyword in [
-            'no space left', 'disk full', 'insufficient space'
-        ]):
-            return DiskFullError(error_msg, url)
-        
-        # Format errors
-        if any(keyword in error_msg_lower for keyword in [
-            'no video formats found', 'format not available', 'unsupported format'
-        ]):
-            return FormatError(error_msg, url)
-        
-        # Default to unknown error
-        return DownloadError(error_msg, ErrorType.UNKNOWN, url)
+        error_class = _classify_type(error_msg)
+        if error_class is DownloadError:
+            # Default to unknown error
+            return DownloadError(error_msg, ErrorType.UNKNOWN, url)
+        return error_class(error_msg, url)
 
 
 class RetryManager:
     """Manages retry logic with exponential backoff."""
     
-    def __init__(self, config: RetryConfig = None):
+    def __init__(self, config: Optional[RetryConfig] = None):
         self.config = config or RetryConfig()
         self.logger = logging.getLogger(__name__)
-    
+        # The config never changes after construction, so the capped
+        # exponential delays can be computed once instead of per retry
+        self._base_delays = [
+            min(self.config.base_delay * (self.config.exponential_base ** i),
+                self.config.max_delay)
+            for i in range(self.config.max_attempts)
+        ]
+
     def calculate_delay(self, attempt: int) -> float:
         """Calculate delay for the given attempt number."""
-        delay = self.config.base_delay * (self.config.exponential_base ** (attempt - 1))
-        delay = min(delay, self.config.max_delay)
-        
+        # Clamp so attempts beyond max_attempts reuse the last (already
+        # max_delay-capped) step instead of raising IndexError
+        delay = self._base_delays[min(attempt, len(self._base_delays)) - 1]
+
         if self.config.jitter:
-            # Add random jitter ±25%
-            jitter_range = delay * 0.25
-            delay += random.uniform(-jitter_range, jitter_range)
-        
+            # Scale by a random factor in [0.75, 1.25] (±25% jitter)
+            delay *= 0.75 + 0.5 * random.random()
+
         return max(0, delay)
     
     def should_retry(self, error: DownloadError, attempt: int) -> bool:
@@ -168,51 +234,41 @@ class RetryManager:
     def retry(self, func: Callable, *args, **kwargs) -> Any:
         """Execute a function with retry logic."""
         last_error = None
-        
-        for attempt in range(1, self.config.max_attempts + 1):
+        max_attempts = self.config.max_attempts
+        logger = self.logger
+
+        for attempt in range(1, max_attempts + 1):
             try:
                 return func(*args, **kwargs)
-                
-            except DownloadError as e:
-                last_error = e
-                self.logger.warning(
-                    f"Attempt {attempt}/{self.config.max_attempts} failed: {e}",
-                    extra={'error_type': e.error_type.value, 'url': e.url}
-                )
-                
-                if not self.should_retry(e, attempt):
-                    self.logger.error(f"Giving up after {attempt} attempts")
-                    raise e
-                
-                if attempt < self.config.max_attempts:
-                    delay = self.calculate_delay(attempt)
-                    self.logger.info(f"Retrying in {delay:.1f} seconds...")
-                    time.sleep(delay)
-                    
+
             except Exception as e:
-                # Convert unknown exceptions to DownloadError
-                classified_error = ErrorClassifier.classify_ytdlp_error(str(e))
-                classified_error.original_error = e
-                last_error = classified_error
-                
-                self.logger.warning(
-                    f"Attempt {attempt}/{self.config.max_attempts} failed with unexpected error: {e}",
-                    extra={'error_type': classified_error.error_type.value}
+                # Classify unknown exceptions into DownloadError
+                if isinstance(e, DownloadError):
+                    error = e
+                else:
+                    error = ErrorClassifier.classify_ytdlp_error(str(e))
+                    error.original_error = e
+                last_error = error
+
+                logger.warning(
+                    f"Attempt {attempt}/{max_attempts} failed: {e}",
+                    extra={'error_type': error.error_type.value, 'url': error.url}
                 )
-                
-                if not self.should_retry(classified_error, attempt):
-                    raise classified_error
-                
-                if attempt < self.config.max_attempts:
+
+                if not self.should_retry(error, attempt):
+                    logger.error(f"Giving up after {attempt} attempts")
+                    raise error
+
+                if attempt < max_attempts:
                     delay = self.calculate_delay(attempt)
-                    self.logger.info(f"Retrying in {delay:.1f} seconds...")
+                    logger.info(f"Retrying in {delay:.1f} seconds...")
                     time.sleep(delay)
-        
+
         # If we get here, all attempts failed
         raise last_error
 
 
-def with_retry(retry_config: Optional[RetryConfig] = None):
+def with_retry(retry_config: Optional[RetryConfig] = None) -> Callable:
     """Decorator to add retry functionality to a function."""
     def decorator(func):
         @wraps(func)
@@ -226,40 +282,43 @@ def with_retry(retry_config: Optional[RetryConfig] = None):
 class CircuitBreaker:
     """Circuit breaker pattern for handling repeated failures."""
     
-    def __init__(self, failure_threshold: int = 5, timeout: int = 60):
+    def __init__(self, failure_threshold: int = 5, timeout: int = 60) -> None:
         self.failure_threshold = failure_threshold
         self.timeout = timeout
         self.failure_count = 0
-        self.last_failure_time = None
+        # Monotonic clock: immune to NTP jumps that could otherwise trap
+        # the breaker open (or close it early) after a wall-clock step
+        self.last_failure_ns = 0
+        self._timeout_ns = timeout * 1_000_000_000
         self.state = 'closed'  # closed, open, half-open
         self.logger = logging.getLogger(__name__)
-    
+
     def can_execute(self) -> bool:
         """Check if execution is allowed based on circuit breaker state."""
         if self.state == 'closed':
             return True
-        
+
         if self.state == 'open':
-            if time.time() - self.last_failure_time > self.timeout:
+            if time.monotonic_ns() - self.last_failure_ns > self._timeout_ns:
                 self.state = 'half-open'
                 self.logger.info("Circuit breaker transitioning to half-open")
                 return True
             return False
-        
+
         # half-open state
         return True
     
-    def record_success(self):
+    def record_success(self) -> None:
         """Record a successful execution."""
         if self.state == 'half-open':
             self.state = 'closed'
             self.failure_count = 0
             self.logger.info("Circuit breaker closed - service recovered")
     
-    def record_failure(self):
+    def record_failure(self) -> None:
         """Record a failed execution."""
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_ns = time.monotonic_ns()
         
         if self.failure_count >= self.failure_threshold:
             if self.state != 'open':
@@ -270,36 +329,44 @@ class CircuitBreaker:
 class GracefulShutdown:
     """Handles graceful shutdown of download operations."""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.shutdown_requested = False
         self.active_downloads = set()
+        self._cond = threading.Condition()
         self.logger = logging.getLogger(__name__)
-    
-    def request_shutdown(self):
+
+    def request_shutdown(self) -> None:
         """Request a graceful shutdown."""
         self.shutdown_requested = True
         self.logger.info("Graceful shutdown requested")
-    
+
     def is_shutdown_requested(self) -> bool:
         """Check if shutdown has been requested."""
         return self.shutdown_requested
-    
-    def register_download(self, download_id: str):
+
+    def register_download(self, download_id: str) -> None:
         """Register an active download."""
-        self.active_downloads.add(download_id)
-    
-    def unregister_download(self, download_id: str):
+        with self._cond:
+            self.active_downloads.add(download_id)
+
+    def unregister_download(self, download_id: str) -> None:
         """Unregister a completed download."""
-        self.active_downloads.discard(download_id)
-    
-    def wait_for_completion(self, timeout: int = 300):
+        with self._cond:
+            self.active_downloads.discard(download_id)
+            self._cond.notify_all()
+
+    def wait_for_completion(self, timeout: int = 300) -> None:
         """Wait for all active downloads to complete."""
-        start_time = time.time()
-        
-        while self.active_downloads and (time.time() - start_time) < timeout:
-            self.logger.info(f"Waiting for {len(self.active_downloads)} downloads to complete...")
-            time.sleep(5)
-        
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while self.active_downloads:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.logger.info(f"Waiting for {len(self.active_downloads)} downloads to complete...")
+                self._cond.wait(timeout=remaining)
+
         if self.active_downloads:
             self.logger.warning(f"Timeout reached. {len(self.active_downloads)} downloads still active.")
         else:
@@ -6,26 +6,43 @@ Professional API server to handle Chrome extension requests
 import os
 import json
 import asyncio
-import logging
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from pathlib import Path
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, send_from_directory
 from flask_cors import CORS
+
+try:
+    from waitress import serve as _waitress_serve
+except ImportError:
+    _waitress_serve = None
+import secrets
 import threading
 import time
-import uuid
 import queue
-from dataclasses import dataclass, asdict
+from collections import Counter
+
+try:
+    import orjson
+
+    def _json_bytes(payload: Any) -> bytes:
+        return orjson.dumps(payload)
+except ImportError:
+    orjson = None
+
+    def _json_bytes(payload: Any) -> bytes:
+        return json.dumps(payload).encode('utf-8')
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 
 # Import our downloader modules
 from youtube_downloader import YouTubeDownloader, DownloadConfig
-from config import Config
-from logging_config import setup_logging
-from database import DatabaseManager
-from progress_tracking import ProgressTracker
+from config import ConfigManager
+from logging_config import setup_global_logger, get_logger
+from database import DownloadDatabase
 
-@dataclass
+@dataclass(slots=True)
 class DownloadTask:
     """Represents a download task"""
     id: str
@@ -39,13 +56,29 @@ class DownloadTask:
     speed: str = ""
     eta: str = ""
     error_message: str = ""
-    created_at: datetime = None
-    updated_at: datetime = None
+    created_at_ns: int = 0  # epoch ns; rendered as ISO only at the API edge
+    updated_at_ns: int = 0
+    _last_progress_ts: float = 0.0  # monotonic time of the last applied hook
 
     def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        if self.created_at_ns == 0:
+            self.created_at_ns = time.time_ns()
+        self.updated_at_ns = time.time_ns()
+
+def _iso(ns: int) -> str:
+    """Render an epoch-ns timestamp as an ISO 8601 string"""
+    return datetime.fromtimestamp(ns / 1e9).isoformat()
+
+
+# Terminal task states eligible for cleanup
+_FINISHED_STATUSES = frozenset({'completed', 'failed'})
+
+# Thresholds for human-readable speed formatting, largest first
+_SPEED_UNITS = (
+    (1 << 20, 'MB/s', 1 << 20),
+    (1 << 10, 'KB/s', 1 << 10),
+    (0, 'B/s', 1),
+)
 
 class ExtensionAPIServer:
     """Chrome Extension API Server"""
@@ -58,29 +91,38 @@ class ExtensionAPIServer:
         self.port = port
         
         # Initialize components
-        self.config = Config()
+        self.config = ConfigManager().load_config()
         self.setup_logging()
-        self.downloader = YouTubeDownloader(self.config)
-        self.db = DatabaseManager(self.config.database_path)
-        
+        self.logger = get_logger(__name__)
+        self.db = DownloadDatabase(self.config.database_path)
+
         # Download management
         self.download_tasks: Dict[str, DownloadTask] = {}
+        self._tasks_lock = threading.RLock()  # guards download_tasks and _status_counts
+        self._status_counts = Counter()  # status -> task count, kept in sync
         self.download_queue = queue.Queue()
         self.is_processing = False
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.config.concurrent_downloads,
+            thread_name_prefix='dl'
+        )
         
+        # Restore persisted tasks so /api/status survives restarts
+        self._load_persisted_tasks()
+
         # Setup routes
         self.setup_routes()
         
         # Start background worker
         self.worker_thread = threading.Thread(target=self.download_worker, daemon=True)
         self.worker_thread.start()
-        
-        self.logger = logging.getLogger(__name__)
+
         self.logger.info("Extension API Server initialized")
 
     def setup_logging(self):
         """Setup logging configuration"""
-        setup_logging(self.config.log_level, self.config.log_file)
+        setup_global_logger(self.config.log_level, self.config.log_file,
+                            self.config.log_max_size, self.config.log_backup_count)
 
     def setup_routes(self):
         """Setup Flask routes"""
@@ -88,12 +130,11 @@ class ExtensionAPIServer:
         @self.app.route('/api/health', methods=['GET'])
         def health_check():
             """Health check endpoint"""
-            return jsonify({
+            return self._json({
                 'status': 'healthy',
                 'timestamp': datetime.now().isoformat(),
                 'version': '1.0.0',
-                'downloads_active': len([t for t in self.download_tasks.values() 
-                                       if t.status == 'downloading'])
+                'downloads_active': self._status_counts['downloading']
             })
 
         @self.app.route('/api/download/playlist', methods=['POST'])
@@ -102,10 +143,10 @@ class ExtensionAPIServer:
             try:
                 data = request.get_json()
                 if not data or 'url' not in data:
-                    return jsonify({'success': False, 'error': 'URL is required'}), 400
+                    return self._json({'success': False, 'error': 'URL is required'}, 400)
 
                 # Create download task
-                task_id = str(uuid.uuid4())
+                task_id = secrets.token_hex(8)
                 task = DownloadTask(
                     id=task_id,
                     url=data['url'],
@@ -113,7 +154,7 @@ class ExtensionAPIServer:
                     status='pending'
                 )
                 
-                self.download_tasks[task_id] = task
+                self._add_task(task)
                 
                 # Add to download queue
                 download_config = self.create_download_config(data)
@@ -121,7 +162,7 @@ class ExtensionAPIServer:
                 
                 self.logger.info(f"Playlist download queued: {task_id}")
                 
-                return jsonify({
+                return self._json({
                     'success': True,
                     'data': {
                         'downloadId': task_id,
@@ -131,7 +172,7 @@ class ExtensionAPIServer:
 
             except Exception as e:
                 self.logger.error(f"Playlist download error: {str(e)}")
-                return jsonify({'success': False, 'error': str(e)}), 500
+                return self._json({'success': False, 'error': str(e)}, 500)
 
         @self.app.route('/api/download/video', methods=['POST'])
         def download_video():
@@ -139,10 +180,10 @@ class ExtensionAPIServer:
             try:
                 data = request.get_json()
                 if not data or 'url' not in data:
-                    return jsonify({'success': False, 'error': 'URL is required'}), 400
+                    return self._json({'success': False, 'error': 'URL is required'}, 400)
 
                 # Create download task
-                task_id = str(uuid.uuid4())
+                task_id = secrets.token_hex(8)
                 task = DownloadTask(
                     id=task_id,
                     url=data['url'],
@@ -150,7 +191,7 @@ class ExtensionAPIServer:
                     status='pending'
                 )
                 
-                self.download_tasks[task_id] = task
+                self._add_task(task)
                 
                 # Add to download queue
                 download_config = self.create_download_config(data)
@@ -158,7 +199,7 @@ class ExtensionAPIServer:
                 
                 self.logger.info(f"Video download queued: {task_id}")
                 
-                return jsonify({
+                return self._json({
                     'success': True,
                     'data': {
                         'downloadId': task_id,
@@ -168,18 +209,18 @@ class ExtensionAPIServer:
 
             except Exception as e:
                 self.logger.error(f"Video download error: {str(e)}")
-                return jsonify({'success': False, 'error': str(e)}), 500
+                return self._json({'success': False, 'error': str(e)}, 500)
 
         @self.app.route('/api/status/<task_id>', methods=['GET'])
         def get_download_status(task_id):
             """Get download status for a specific task"""
             try:
                 if task_id not in self.download_tasks:
-                    return jsonify({'success': False, 'error': 'Task not found'}), 404
+                    return self._json({'success': False, 'error': 'Task not found'}, 404)
 
                 task = self.download_tasks[task_id]
                 
-                return jsonify({
+                return self._json({
                     'success': True,
                     'data': {
                         'id': task.id,
@@ -192,21 +233,32 @@ class ExtensionAPIServer:
                         'eta': task.eta,
                         'errorMessage': task.error_message,
                         'type': task.type,
-                        'createdAt': task.created_at.isoformat(),
-                        'updatedAt': task.updated_at.isoformat()
+                        'createdAt': _iso(task.created_at_ns),
+                        'updatedAt': _iso(task.updated_at_ns)
                     }
                 })
 
             except Exception as e:
                 self.logger.error(f"Status check error: {str(e)}")
-                return jsonify({'success': False, 'error': str(e)}), 500
+                return self._json({'success': False, 'error': str(e)}, 500)
 
         @self.app.route('/api/downloads', methods=['GET'])
         def get_all_downloads():
             """Get all download tasks"""
             try:
+                # Snapshot under the lock, serialize outside it
+                with self._tasks_lock:
+                    tasks_snapshot = list(self.download_tasks.values())
+                    summary = {
+                        'total': len(self.download_tasks),
+                        'pending': self._status_counts['pending'],
+                        'downloading': self._status_counts['downloading'],
+                        'completed': self._status_counts['completed'],
+                        'failed': self._status_counts['failed']
+                    }
+
                 tasks_data = []
-                for task in self.download_tasks.values():
+                for task in tasks_snapshot:
                     tasks_data.append({
                         'id': task.id,
                         'url': task.url,
@@ -215,33 +267,27 @@ class ExtensionAPIServer:
                         'progress': task.progress,
                         'totalVideos': task.total_videos,
                         'completedVideos': task.completed_videos,
-                        'createdAt': task.created_at.isoformat(),
-                        'updatedAt': task.updated_at.isoformat()
+                        'createdAt': _iso(task.created_at_ns),
+                        'updatedAt': _iso(task.updated_at_ns)
                     })
 
-                return jsonify({
+                return self._json({
                     'success': True,
                     'data': {
                         'tasks': tasks_data,
-                        'summary': {
-                            'total': len(self.download_tasks),
-                            'pending': len([t for t in self.download_tasks.values() if t.status == 'pending']),
-                            'downloading': len([t for t in self.download_tasks.values() if t.status == 'downloading']),
-                            'completed': len([t for t in self.download_tasks.values() if t.status == 'completed']),
-                            'failed': len([t for t in self.download_tasks.values() if t.status == 'failed'])
-                        }
+                        'summary': summary
                     }
                 })
 
             except Exception as e:
                 self.logger.error(f"Get downloads error: {str(e)}")
-                return jsonify({'success': False, 'error': str(e)}), 500
+                return self._json({'success': False, 'error': str(e)}, 500)
 
         @self.app.route('/api/settings', methods=['GET'])
         def get_settings():
             """Get current downloader settings"""
             try:
-                return jsonify({
+                return self._json({
                     'success': True,
                     'data': {
                         'quality': 'best',
@@ -257,7 +303,7 @@ class ExtensionAPIServer:
 
             except Exception as e:
                 self.logger.error(f"Get settings error: {str(e)}")
-                return jsonify({'success': False, 'error': str(e)}), 500
+                return self._json({'success': False, 'error': str(e)}, 500)
 
         @self.app.route('/api/settings', methods=['POST'])
         def update_settings():
@@ -267,7 +313,7 @@ class ExtensionAPIServer:
                 # Here you would update the config
                 # For now, just return success
                 
-                return jsonify({
+                return self._json({
                     'success': True,
                     'data': {
                         'message': 'Settings updated successfully'
@@ -276,7 +322,7 @@ class ExtensionAPIServer:
 
             except Exception as e:
                 self.logger.error(f"Update settings error: {str(e)}")
-                return jsonify({'success': False, 'error': str(e)}), 500
+                return self._json({'success': False, 'error': str(e)}, 500)
 
         @self.app.route('/dashboard', methods=['GET'])
         def dashboard():
@@ -288,94 +334,173 @@ class ExtensionAPIServer:
             """Serve static files"""
             return send_from_directory('static', filename)
 
+    def _json(self, payload: Any, status: int = 200):
+        """Build a JSON response without going through Flask's jsonify"""
+        return self.app.response_class(
+            _json_bytes(payload), status=status, mimetype='application/json'
+        )
+
+    def _add_task(self, task: DownloadTask):
+        """Register a new task and count its initial status."""
+        with self._tasks_lock:
+            self.download_tasks[task.id] = task
+            self._status_counts[task.status] += 1
+        self._persist_task(task)
+
+    def _set_status(self, task: DownloadTask, new_status: str):
+        """Transition a task's status, keeping the counters in sync."""
+        with self._tasks_lock:
+            self._status_counts[task.status] -= 1
+            self._status_counts[new_status] += 1
+            task.status = new_status
+            task.updated_at_ns = time.time_ns()
+        self._persist_task(task)
+
+    def _load_persisted_tasks(self):
+        """Rebuild the in-memory task table from the database.
+
+        Tasks that were still pending or downloading when the previous
+        process died cannot resume (their queue entries are gone), so
+        they come back marked failed rather than lingering forever.
+        """
+        restored = 0
+        with self._tasks_lock:
+            for (task_id, url, task_type, status, progress, error_message,
+                 created_at_ns, updated_at_ns) in self.db.get_tasks():
+                task = DownloadTask(
+                    id=task_id, url=url, type=task_type, status=status,
+                    progress=progress, error_message=error_message,
+                    created_at_ns=created_at_ns
+                )
+                task.updated_at_ns = updated_at_ns
+                if status not in _FINISHED_STATUSES:
+                    task.status = 'failed'
+                    task.error_message = 'Interrupted by server restart'
+                    self._persist_task(task)
+                self.download_tasks[task.id] = task
+                self._status_counts[task.status] += 1
+                restored += 1
+        if restored:
+            self.logger.info(f"Restored {restored} persisted tasks")
+
+    def _persist_task(self, task: DownloadTask):
+        """Write-through a task's state to the database."""
+        try:
+            self.db.upsert_task(
+                task.id, task.url, task.type, task.status,
+                task.progress, task.error_message,
+                task.created_at_ns, task.updated_at_ns
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to persist task {task.id}: {str(e)}")
+
     def create_download_config(self, data: Dict[str, Any]) -> DownloadConfig:
-        """Create download configuration from request data"""
-        
-        # Determine quality and format based on settings
+        """Create download configuration from request data
+
+        Requests only vary in quality and container; everything else
+        (output dir, rate limit, database, logging) follows the server
+        config. The downloader derives its yt-dlp format selector from
+        max_quality and video_format itself.
+        """
+        config = replace(self.config)
         quality = data.get('quality', 'best')
-        format_pref = data.get('format', 'mp4')
-        audio_guarantee = data.get('audioGuarantee', True)
-        
-        if audio_guarantee:
-            # Use simple format that guarantees audio
-            format_string = 'best[acodec!=none]/best'
-        else:
-            # Use more specific quality if audio guarantee is off
-            if quality == 'best':
-                format_string = f'best[ext={format_pref}]/best'
-            else:
-                format_string = f'best[height<={quality}][ext={format_pref}]/best[height<={quality}]/best'
-
-        return DownloadConfig(
-            quality=quality,
-            format=format_string,
-            output_dir=self.config.output_dir,
-            audio_quality='best',
-            subtitle_langs=[],
-            write_info_json=False,
-            write_thumbnail=False,
-            write_description=False,
-            embed_subs=False,
-            notifications=data.get('notifications', True)
-        )
+        if quality != 'best':
+            config.max_quality = quality
+        config.video_format = data.get('format', self.config.video_format)
+        return config
 
     def download_worker(self):
         """Background worker to process downloads"""
         while True:
+            # Block until work arrives; no polling, no dispatch latency
+            item = self.download_queue.get()
+            if item is None:  # shutdown sentinel
+                self.download_queue.task_done()
+                break
+
+            task_id, config = item
             try:
-                if not self.download_queue.empty():
-                    task_id, config = self.download_queue.get()
-                    
-                    if task_id in self.download_tasks:
-                        task = self.download_tasks[task_id]
-                        task.status = 'downloading'
-                        task.updated_at = datetime.now()
-                        
-                        # Create progress callback
-                        def progress_callback(info):
-                            self.update_task_progress(task_id, info)
-                        
-                        try:
-                            # Perform the download
-                            self.logger.info(f"Starting download: {task_id}")
-                            
-                            if task.type == 'playlist':
-                                result = self.downloader.download_playlist(
-                                    task.url, config, progress_callback
-                                )
-                            else:
-                                result = self.downloader.download_video(
-                                    task.url, config, progress_callback
-                                )
-                            
-                            # Mark as completed
-                            task.status = 'completed'
-                            task.progress = 100.0
-                            task.updated_at = datetime.now()
-                            
-                            self.logger.info(f"Download completed: {task_id}")
-                            
-                        except Exception as e:
-                            # Mark as failed
-                            task.status = 'failed'
-                            task.error_message = str(e)
-                            task.updated_at = datetime.now()
-                            
-                            self.logger.error(f"Download failed {task_id}: {str(e)}")
-                
-                # Sleep briefly before checking again
-                time.sleep(1)
-                
+                # Hand off to the pool so downloads run concurrently
+                self._pool.submit(self._run_download, task_id, config)
             except Exception as e:
                 self.logger.error(f"Download worker error: {str(e)}")
-                time.sleep(5)  # Wait longer on worker error
+            finally:
+                self.download_queue.task_done()
 
-    def update_task_progress(self, task_id: str, info: Dict[str, Any]):
-        """Update task progress from yt-dlp hook"""
+    def _run_download(self, task_id: str, config: DownloadConfig):
+        """Execute a single queued download on a pool thread"""
         if task_id not in self.download_tasks:
             return
-            
+
         task = self.download_tasks[task_id]
+        self._set_status(task, 'downloading')
+
+        # Bridge the tracker's per-download stats into the task record
+        def progress_callback(download_id: str, stats):
+            info = {
+                'status': stats.status,
+                'downloaded_bytes': stats.downloaded_bytes,
+                'filename': stats.filename,
+                'speed': stats.speed,
+                'eta': stats.eta,
+            }
+            if stats.total_bytes:
+                info['total_bytes'] = stats.total_bytes
+            self.update_task_progress(task_id, info)
+
+        downloader = None
+        try:
+            # Perform the download; each task gets a downloader built
+            # from its own config. yt-dlp resolves single-video URLs
+            # through the same entry point as playlists.
+            self.logger.info(f"Starting download: {task_id}")
+
+            downloader = YouTubeDownloader(config)
+            downloader.progress_tracker.add_callback(progress_callback)
+            success = downloader.download_playlist(task.url)
+
+            # Mark as completed; fields go first so _set_status persists
+            # the finished state, not the pre-terminal one
+            if success:
+                task.progress = 100.0
+                self._set_status(task, 'completed')
+                self.logger.info(f"Download completed: {task_id}")
+            else:
+                task.error_message = 'One or more downloads failed'
+                self._set_status(task, 'failed')
+                self.logger.error(f"Download failed: {task_id}")
+
+        except Exception as e:
+            # Mark as failed
+            task.error_message = str(e)
+            self._set_status(task, 'failed')
+
+            self.logger.error(f"Download failed {task_id}: {str(e)}")
+        finally:
+            if downloader is not None:
+                downloader.cleanup()
+
+    def shutdown(self):
+        """Stop the background worker gracefully"""
+        self.download_queue.put(None)
+        self.worker_thread.join(timeout=30)
+        self._pool.shutdown(wait=True)
+
+    def update_task_progress(self, task_id: str, info: Dict[str, Any]):
+        """Update task progress from yt-dlp hook"""
+        with self._tasks_lock:
+            task = self.download_tasks.get(task_id)
+        if task is None:
+            return
+
+        # yt-dlp fires this hook per chunk (hundreds of Hz); the extension
+        # polls at 1 Hz, so drop intermediate updates beyond 10 Hz. Terminal
+        # states ('finished', 'error') always pass through.
+        now = time.monotonic()
+        if (info.get('status') == 'downloading'
+                and now - task._last_progress_ts < 0.1):
+            return
+        task._last_progress_ts = now
         
         # Update progress information
         if 'downloaded_bytes' in info and 'total_bytes' in info:
@@ -388,34 +513,44 @@ class ExtensionAPIServer:
         if 'speed' in info and info['speed']:
             # Convert speed to human readable format
             speed = info['speed']
-            if speed > 1024 * 1024:
-                task.speed = f"{speed / (1024 * 1024):.1f} MB/s"
-            elif speed > 1024:
-                task.speed = f"{speed / 1024:.1f} KB/s"
-            else:
-                task.speed = f"{speed:.1f} B/s"
+            for threshold, unit, divisor in _SPEED_UNITS:
+                if speed > threshold:
+                    task.speed = f"{speed / divisor:.1f} {unit}"
+                    break
         
         if 'eta' in info and info['eta']:
             task.eta = f"{info['eta']}s"
             
-        task.updated_at = datetime.now()
+        task.updated_at_ns = time.time_ns()
 
     def cleanup_old_tasks(self, max_age_hours=24):
         """Clean up old completed tasks"""
-        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
-        
-        to_remove = []
-        for task_id, task in self.download_tasks.items():
-            if (task.status in ['completed', 'failed'] and 
-                task.updated_at < cutoff_time):
-                to_remove.append(task_id)
+        cutoff_ns = time.time_ns() - max_age_hours * 3600 * 10**9
         
-        for task_id in to_remove:
-            del self.download_tasks[task_id]
+        with self._tasks_lock:
+            to_remove = [
+                task_id for task_id, task in self.download_tasks.items()
+                if task.status in _FINISHED_STATUSES
+                and task.updated_at_ns < cutoff_ns
+            ]
+
+            for task_id in to_remove:
+                self._status_counts[self.download_tasks[task_id].status] -= 1
+                del self.download_tasks[task_id]
         
+        try:
+            self.db.delete_stale_tasks(cutoff_ns)
+        except Exception as e:
+            self.logger.error(f"Failed to prune persisted tasks: {str(e)}")
+
         if to_remove:
             self.logger.info(f"Cleaned up {len(to_remove)} old tasks")
 
+        # threading.Timer fires once; re-arm so cleanup keeps running
+        timer = threading.Timer(3600, self.cleanup_old_tasks)
+        timer.daemon = True
+        timer.start()
+
     def run(self, debug=False):
         """Start the API server"""
         self.logger.info(f"Starting Extension API Server on {self.host}:{self.port}")
@@ -426,7 +561,15 @@ class ExtensionAPIServer:
         cleanup_timer.start()
         
         try:
-            self.app.run(host=self.host, port=self.port, debug=debug, threaded=True)
+            if _waitress_serve is not None and not debug:
+                # Production WSGI server: fixed thread pool, keepalive, far
+                # lower per-request overhead than Werkzeug's dev server
+                _waitress_serve(
+                    self.app, host=self.host, port=self.port,
+                    threads=8, connection_limit=1000, channel_timeout=120
+                )
+            else:
+                self.app.run(host=self.host, port=self.port, debug=debug, threaded=True)
         except Exception as e:
             self.logger.error(f"Server error: {str(e)}")
             raise
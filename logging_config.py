@@ -1,13 +1,79 @@
 """Logging configuration for YouTube Downloader."""
 
+import atexit
+import hashlib
 import logging
 import logging.handlers
+import os
+import queue
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
 import json
 from datetime import datetime
 
+try:
+    import zstandard
+
+    _BACKUP_SUFFIX = '.zst'
+
+    def _compress_stream(src, dst):
+        zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+except ImportError:
+    import gzip
+    import shutil
+
+    zstandard = None
+    _BACKUP_SUFFIX = '.gz'
+
+    def _compress_stream(src, dst):
+        with gzip.GzipFile(fileobj=dst, mode='wb', compresslevel=6) as gz:
+            shutil.copyfileobj(src, gz)
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    orjson = None
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj)
+
+
+# Per-thread cache of the last formatted timestamp; most records within
+# the same second reuse the string instead of re-running strftime
+_TS_CACHE = threading.local()
+
+# Thread-local extras attached to records by _ContextFilter, bypassing
+# makeRecord's per-key validation loop (which also rejects useful keys
+# like 'filename' that collide with LogRecord's own attributes)
+_log_ctx = threading.local()
+
+
+class _ContextFilter(logging.Filter):
+    """Copy thread-local context onto each record in one dict update."""
+
+    def filter(self, record):
+        extra = getattr(_log_ctx, 'extra', None)
+        if extra:
+            record.__dict__.update(extra)
+        return True
+
+
+@contextmanager
+def log_ctx(**extra):
+    """Attach extra fields to records emitted inside the block."""
+    _log_ctx.extra = extra
+    try:
+        yield
+    finally:
+        _log_ctx.extra = None
+
 
 class ColoredFormatter(logging.Formatter):
     """Colored formatter for console output."""
@@ -21,44 +87,187 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': '\033[35m', # Magenta
         'RESET': '\033[0m'      # Reset
     }
-    
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Level -> colored levelname, built once instead of per record
+        reset = self.COLORS['RESET']
+        self._colored = {
+            level: f"{color}{level}{reset}"
+            for level, color in self.COLORS.items() if level != 'RESET'
+        }
+
     def format(self, record):
-        # Add color to levelname
-        if record.levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.COLORS['RESET']}"
-        
-        return super().format(record)
+        # Swap in the colored levelname without leaking the mutation to
+        # other handlers sharing this record
+        original = record.levelname
+        record.levelname = self._colored.get(original, original)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = original
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        if (getattr(_TS_CACHE, 'console_sec', -1) != sec
+                or getattr(_TS_CACHE, 'console_fmt', None) != datefmt):
+            _TS_CACHE.console_text = time.strftime(
+                datefmt or '%Y-%m-%d %H:%M:%S', time.localtime(record.created))
+            _TS_CACHE.console_sec = sec
+            _TS_CACHE.console_fmt = datefmt
+        return _TS_CACHE.console_text
 
 
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging."""
-    
+
+    # Optional extras attached via logger.*(..., extra={...})
+    _EXTRA_KEYS = frozenset(('url', 'filename', 'progress', 'download_id'))
+
     def format(self, record):
+        # Avoid the getMessage() call for the common no-args case
+        msg = record.msg % record.args if record.args else record.msg
+
+        # ISO timestamp cached per whole second, with milliseconds appended
+        sec = int(record.created)
+        if getattr(_TS_CACHE, 'iso_sec', -1) != sec:
+            _TS_CACHE.iso_text = time.strftime('%Y-%m-%dT%H:%M:%S',
+                                               time.localtime(sec))
+            _TS_CACHE.iso_sec = sec
+
         log_entry = {
-            'timestamp': datetime.fromtimestamp(record.created).isoformat(),
+            'timestamp': f"{_TS_CACHE.iso_text}.{int(record.msecs):03d}",
             'level': record.levelname,
             'logger': record.name,
-            'message': record.getMessage(),
+            'message': msg,
             'module': record.module,
             'function': record.funcName,
             'line': record.lineno
         }
         
-        # Add exception info if present
+        # Add exception info if present; cache the traceback text on the
+        # record so repeated formats reuse it
         if record.exc_info:
-            log_entry['exception'] = self.formatException(record.exc_info)
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_entry['exception'] = record.exc_text
         
-        # Add extra fields
-        if hasattr(record, 'url'):
-            log_entry['url'] = record.url
-        if hasattr(record, 'filename'):
-            log_entry['filename'] = record.filename
-        if hasattr(record, 'progress'):
-            log_entry['progress'] = record.progress
-        if hasattr(record, 'download_id'):
-            log_entry['download_id'] = record.download_id
-            
-        return json.dumps(log_entry)
+        # Add extra fields in one pass over the record's attribute dict
+        record_dict = record.__dict__
+        for key in self._EXTRA_KEYS & record_dict.keys():
+            log_entry[key] = record_dict[key]
+
+        return _dumps(log_entry)
+
+
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that sizes the log file in memory.
+
+    The stock handler inspects the stream position for every record; this
+    variant tracks an approximate byte count and only consults the real
+    file size when the threshold is near.
+    """
+
+    # Buffer this much before the OS sees a write; flushed on WARNING+,
+    # every 30 seconds, on rollover and at exit
+    _BUFFER_SIZE = 65536
+    _FLUSH_INTERVAL = 30.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        try:
+            self._approx_size = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._approx_size = 0
+        self._flush_timer = None
+        self._schedule_flush()
+        atexit.register(self._safe_flush)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode,
+                    buffering=self._BUFFER_SIZE, encoding=self.encoding)
+
+    def emit(self, record):
+        """Emit a record without the per-record flush of StreamHandler."""
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            # Don't sit on warnings/errors; let routine records buffer
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def _schedule_flush(self):
+        self._flush_timer = threading.Timer(self._FLUSH_INTERVAL,
+                                            self._timed_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _timed_flush(self):
+        self._safe_flush()
+        self._schedule_flush()
+
+    def _safe_flush(self):
+        try:
+            self.flush()
+        except ValueError:
+            pass  # stream already closed
+
+    def close(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        super().close()
+
+    def shouldRollover(self, record):
+        if self.maxBytes <= 0:
+            return False
+
+        estimated = len(self.format(record).encode('utf-8')) + 1
+        if self._approx_size + estimated < self.maxBytes:
+            self._approx_size += estimated
+            return False
+
+        # Near the threshold: flush buffered output, then confirm
+        # against the actual file size
+        self._safe_flush()
+        try:
+            self._approx_size = os.path.getsize(self.baseFilename)
+        except OSError:
+            pass
+        if self._approx_size + estimated >= self.maxBytes:
+            return True
+        self._approx_size += estimated
+        return False
+
+    def doRollover(self):
+        super().doRollover()
+        self._approx_size = 0
+
+
+def _backup_namer(name: str) -> str:
+    """Name rotated backups with the compression suffix."""
+    return name + _BACKUP_SUFFIX
+
+
+def _backup_rotator(source: str, dest: str) -> None:
+    """Compress a rotated log file instead of keeping it as plaintext.
+
+    JSON logs compress roughly an order of magnitude, so the backups use
+    a tenth of the disk. Runs on the queue listener thread, so download
+    threads never wait on it.
+    """
+    try:
+        with open(source, 'rb') as src, open(dest, 'wb') as dst:
+            _compress_stream(src, dst)
+        os.remove(source)
+    except OSError:
+        # Fall back to the plain rename rather than losing the file
+        if os.path.exists(source):
+            os.replace(source, dest)
 
 
 class DownloadLogger:
@@ -75,10 +284,13 @@ class DownloadLogger:
             max_size: Maximum log file size in bytes
             backup_count: Number of backup files to keep
         """
-        self.log_level = getattr(logging, log_level.upper())
+        # Plain dict lookup instead of attribute search on the module
+        self.log_level = logging._nameToLevel[log_level.upper()]
         self.log_file = Path(log_file) if log_file else None
         self.max_size = max_size
         self.backup_count = backup_count
+        self._listener = None
+        self._last_progress = {}  # filename -> (monotonic time, percent)
         
         self.setup_logging()
     
@@ -90,6 +302,8 @@ class DownloadLogger:
         
         # Clear existing handlers
         self.logger.handlers.clear()
+        self.logger.filters.clear()
+        self.logger.addFilter(_ContextFilter())
         
         # Console handler with colored output
         console_handler = logging.StreamHandler(sys.stdout)
@@ -100,14 +314,14 @@ class DownloadLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        handlers = [console_handler]
         
         # File handler with rotation (if log_file is specified)
         if self.log_file:
             # Create log directory if it doesn't exist
             self.log_file.parent.mkdir(parents=True, exist_ok=True)
             
-            file_handler = logging.handlers.RotatingFileHandler(
+            file_handler = FastRotatingFileHandler(
                 self.log_file,
                 maxBytes=self.max_size,
                 backupCount=self.backup_count,
@@ -117,64 +331,75 @@ class DownloadLogger:
             
             file_formatter = JSONFormatter()
             file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            file_handler.namer = _backup_namer
+            file_handler.rotator = _backup_rotator
+            handlers.append(file_handler)
+        
+        # Route records through a queue so logging calls return without
+        # waiting on formatting or disk writes; a background listener
+        # thread drains the queue into the real handlers
+        self._stop_listener()
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self._stop_listener)
         
         # Set up yt-dlp logger to use our system
         ytdl_logger = logging.getLogger('yt-dlp')
         ytdl_logger.setLevel(logging.WARNING)  # Reduce yt-dlp verbosity
         ytdl_logger.handlers = self.logger.handlers
         
+    def _stop_listener(self):
+        """Stop the queue listener if it is running (idempotent)."""
+        if self._listener is not None and self._listener._thread is not None:
+            self._listener.stop()
+
     def get_logger(self, name: str = 'yt_downloader') -> logging.Logger:
         """Get a logger instance."""
         return logging.getLogger(name)
     
     def log_download_start(self, url: str, output_dir: str):
         """Log the start of a download."""
-        logger = self.get_logger()
-        logger.info("Download started", extra={
-            'url': url,
-            'output_dir': output_dir,
-            'download_id': self._generate_download_id(url)
-        })
+        with log_ctx(url=url, output_dir=output_dir,
+                     download_id=self._generate_download_id(url)):
+            self.logger.info("Download started")
     
     def log_download_progress(self, filename: str, progress: float, speed: str):
         """Log download progress."""
-        logger = self.get_logger()
-        logger.debug("Download progress", extra={
-            'filename': filename,
-            'progress': progress,
-            'speed': speed
-        })
+        # Progress hooks fire per network chunk; only emit when half a
+        # second has passed or progress moved 5% for this file
+        now = time.monotonic()
+        last_time, last_pct = self._last_progress.get(filename, (0.0, 0.0))
+        if now - last_time < 0.5 and abs(progress - last_pct) < 5.0:
+            return
+        self._last_progress[filename] = (now, progress)
+
+        with log_ctx(filename=filename, progress=progress, speed=speed):
+            self.logger.debug("Download progress")
     
     def log_download_complete(self, filename: str, file_size: int):
         """Log download completion."""
-        logger = self.get_logger()
-        logger.info("Download completed", extra={
-            'filename': filename,
-            'file_size': file_size
-        })
+        self._last_progress.pop(filename, None)
+        with log_ctx(filename=filename, file_size=file_size):
+            self.logger.info("Download completed")
     
     def log_download_error(self, url: str, error: str):
         """Log download error."""
-        logger = self.get_logger()
-        logger.error("Download failed", extra={
-            'url': url,
-            'error': error
-        })
+        with log_ctx(url=url, error=error):
+            self.logger.error("Download failed")
     
     def log_playlist_info(self, playlist_title: str, video_count: int):
         """Log playlist information."""
-        logger = self.get_logger()
-        logger.info("Playlist information", extra={
-            'playlist_title': playlist_title,
-            'video_count': video_count
-        })
+        with log_ctx(playlist_title=playlist_title, video_count=video_count):
+            self.logger.info("Playlist information")
     
     def _generate_download_id(self, url: str) -> str:
         """Generate a unique download ID."""
-        import hashlib
         timestamp = str(datetime.now().timestamp())
-        return hashlib.md5(f"{url}{timestamp}".encode()).hexdigest()[:8]
+        return hashlib.blake2b(f"{url}{timestamp}".encode(),
+                               digest_size=4).hexdigest()
 
 
 class YTDLPLogger:
@@ -184,16 +409,19 @@ class YTDLPLogger:
         self.logger = logger
     
     def debug(self, msg):
-        self.logger.debug(f"[yt-dlp] {msg}")
+        # yt-dlp fires debug messages per HTTP chunk; skip all work when
+        # the level is disabled and let logging format lazily otherwise
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("[yt-dlp] %s", msg)
     
     def info(self, msg):
-        self.logger.info(f"[yt-dlp] {msg}")
+        self.logger.info("[yt-dlp] %s", msg)
     
     def warning(self, msg):
-        self.logger.warning(f"[yt-dlp] {msg}")
+        self.logger.warning("[yt-dlp] %s", msg)
     
     def error(self, msg):
-        self.logger.error(f"[yt-dlp] {msg}")
+        self.logger.error("[yt-dlp] %s", msg)
 
 
 # Global logger instance
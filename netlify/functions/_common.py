@@ -0,0 +1,48 @@
+"""Shared helpers for the Netlify function handlers."""
+
+import re
+
+# Single compiled scan instead of two substring checks per URL
+YT_HOST_RE = re.compile(r'(?:youtube\.com|youtu\.be)', re.ASCII)
+
+try:
+    import orjson
+
+    def jbody(obj) -> str:
+        """Serialize a response body to a JSON string."""
+        return orjson.dumps(obj).decode('utf-8')
+
+    jloads = orjson.loads
+except ImportError:
+    import json
+
+    orjson = None
+
+    def jbody(obj) -> str:
+        """Serialize a response body to a JSON string."""
+        return json.dumps(obj)
+
+    jloads = json.loads
+
+
+_METHOD_NOT_ALLOWED_BODY = jbody({'error': 'Method not allowed'})
+
+
+def _make_responses(methods: str):
+    """Build the shared headers plus canned preflight/405 responses."""
+    headers = {
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Methods': methods,
+        'Access-Control-Allow-Headers': 'Content-Type',
+        'Content-Type': 'application/json'
+    }
+    preflight = {'statusCode': 200, 'headers': headers, 'body': ''}
+    not_allowed = {'statusCode': 405, 'headers': headers,
+                   'body': _METHOD_NOT_ALLOWED_BODY}
+    return headers, preflight, not_allowed
+
+
+# Built once per container; warm invocations return these references
+# directly instead of allocating headers and bodies per request
+GET_HEADERS, GET_PREFLIGHT, GET_METHOD_NOT_ALLOWED = _make_responses('GET, OPTIONS')
+POST_HEADERS, POST_PREFLIGHT, POST_METHOD_NOT_ALLOWED = _make_responses('POST, OPTIONS')
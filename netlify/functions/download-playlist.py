@@ -3,152 +3,122 @@ Netlify Function: Download Playlist
 Serverless YouTube playlist downloader API
 """
 
-import json
-import os
-import tempfile
-import subprocess
 import logging
-from datetime import datetime
-import uuid
+import secrets
+from itertools import islice
+
+from _common import (jbody, jloads, POST_HEADERS, POST_PREFLIGHT,
+                     POST_METHOD_NOT_ALLOWED, YT_HOST_RE)
+
+from yt_dlp import YoutubeDL
+
+# Flat extraction: list playlist entries without resolving each video.
+# Imported and built once per container, so warm invocations skip both
+# interpreter startup and yt_dlp's import cost.
+# Stop analyzing after this many entries; the response only reports a
+# count and the first few URLs
+_MAX_ENTRIES = 500
+
+_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'skip_download': True,
+    'extract_flat': 'in_playlist',
+    'socket_timeout': 30,
+}
 
 def handler(event, context):
     """Handle playlist download requests"""
     
-    # Setup CORS headers
-    headers = {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'POST, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type',
-        'Content-Type': 'application/json'
-    }
+    headers = POST_HEADERS
     
     # Handle preflight OPTIONS request
-    if event['httpMethod'] == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': ''
-        }
+    method = event['httpMethod']
+    if method == 'OPTIONS':
+        return POST_PREFLIGHT
     
-    if event['httpMethod'] != 'POST':
-        return {
-            'statusCode': 405,
-            'headers': headers,
-            'body': json.dumps({'error': 'Method not allowed'})
-        }
+    if method != 'POST':
+        return POST_METHOD_NOT_ALLOWED
+    
+    # Parse the request body once, before the handler's work begins
+    raw_body = event.get('body')
+    if raw_body:
+        try:
+            body = jloads(raw_body)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': jbody({'success': False, 'error': 'Invalid JSON body'})
+            }
+    else:
+        body = {}
     
     try:
-        # Parse request body
-        body = json.loads(event['body']) if event['body'] else {}
         url = body.get('url')
         
         if not url:
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'success': False, 'error': 'URL is required'})
+                'body': jbody({'success': False, 'error': 'URL is required'})
             }
         
         # Validate URL
-        if 'youtube.com' not in url and 'youtu.be' not in url:
+        if not YT_HOST_RE.search(url):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'success': False, 'error': 'Invalid YouTube URL'})
+                'body': jbody({'success': False, 'error': 'Invalid YouTube URL'})
             }
         
         # Generate download ID
-        download_id = str(uuid.uuid4())
-        
-        # Get quality settings
-        quality = body.get('quality', 'best')
-        audio_guarantee = body.get('audioGuarantee', True)
-        
-        # Create format selector based on settings
-        if audio_guarantee:
-            format_selector = 'best[acodec!=none]/best'
-        else:
-            format_selector = f'best[height<={quality}]/best' if quality.isdigit() else 'best'
-        
-        # Create temporary directory for download
-        temp_dir = tempfile.mkdtemp()
-        
-        # Prepare yt-dlp command
-        cmd = [
-            'yt-dlp',
-            '--format', format_selector,
-            '--output', f'{temp_dir}/%(title)s.%(ext)s',
-            '--no-write-info-json',
-            '--no-write-thumbnail', 
-            '--no-write-description',
-            '--no-write-annotations',
-            '--no-write-sub',
-            '--no-write-auto-sub',
-            '--extract-flat', 'in_playlist',
-            '--print', '%(webpage_url)s',
-            url
-        ]
+        download_id = secrets.token_hex(16)
         
-        # Execute yt-dlp to get playlist info
+        # Analyze the playlist in-process; no subprocess fork/exec or
+        # JSON piping per request
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                video_urls = result.stdout.strip().split('\n')
-                video_count = len([url for url in video_urls if url.strip()])
-                
-                return {
-                    'statusCode': 200,
-                    'headers': headers,
-                    'body': json.dumps({
-                        'success': True,
-                        'data': {
-                            'downloadId': download_id,
-                            'status': 'analyzed',
-                            'videoCount': video_count,
-                            'message': f'Playlist analyzed: {video_count} videos found. Note: Actual downloading requires local setup due to Netlify limitations.',
-                            'urls': video_urls[:10]  # First 10 URLs for preview
-                        }
-                    })
-                }
-            else:
-                return {
-                    'statusCode': 400,
-                    'headers': headers,
-                    'body': json.dumps({
-                        'success': False,
-                        'error': f'Failed to analyze playlist: {result.stderr}'
-                    })
-                }
-                
-        except subprocess.TimeoutExpired:
+            with YoutubeDL(_YDL_OPTS) as ydl:
+                info = ydl.extract_info(url, download=False)
+
+            # entries may be a lazy generator for large playlists; stream
+            # it and stop at the analysis cap instead of materializing
+            # every entry
+            entries = info.get('entries') or ()
+            video_urls = [
+                entry.get('url') or entry.get('webpage_url')
+                for entry in islice(entries, _MAX_ENTRIES)
+                if entry.get('url') or entry.get('webpage_url')
+            ]
+            video_count = len(video_urls)
+
             return {
-                'statusCode': 408,
+                'statusCode': 200,
                 'headers': headers,
-                'body': json.dumps({
-                    'success': False,
-                    'error': 'Request timeout - playlist analysis took too long'
+                'body': jbody({
+                    'success': True,
+                    'data': {
+                        'downloadId': download_id,
+                        'status': 'analyzed',
+                        'videoCount': video_count,
+                        'message': f'Playlist analyzed: {video_count} videos found. Note: Actual downloading requires local setup due to Netlify limitations.',
+                        'urls': video_urls[:10]  # First 10 URLs for preview
+                    }
                 })
             }
         except Exception as e:
             return {
-                'statusCode': 500,
+                'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': jbody({
                     'success': False,
-                    'error': f'Analysis error: {str(e)}'
+                    'error': f'Failed to analyze playlist: {str(e)}'
                 })
             }
     
-    except json.JSONDecodeError:
-        return {
-            'statusCode': 400,
-            'headers': headers,
-            'body': json.dumps({'success': False, 'error': 'Invalid JSON body'})
-        }
     except Exception as e:
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'success': False, 'error': f'Server error: {str(e)}'})
+            'body': jbody({'success': False, 'error': f'Server error: {str(e)}'})
         }
\ No newline at end of file
@@ -3,62 +3,70 @@ Netlify Function: Download Video
 Serverless YouTube video downloader API
 """
 
-import json
-import os
-import tempfile
-import subprocess
 import logging
-from datetime import datetime
-import uuid
+import secrets
+
+from _common import (jbody, jloads, POST_HEADERS, POST_PREFLIGHT,
+                     POST_METHOD_NOT_ALLOWED, YT_HOST_RE)
+
+from yt_dlp import YoutubeDL
+
+# Metadata-only extraction, built once per container so warm invocations
+# skip interpreter startup and yt_dlp's import cost
+_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'skip_download': True,
+    'socket_timeout': 15,
+}
 
 def handler(event, context):
     """Handle single video download requests"""
     
-    # Setup CORS headers
-    headers = {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'POST, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type',
-        'Content-Type': 'application/json'
-    }
+    headers = POST_HEADERS
     
     # Handle preflight OPTIONS request
-    if event['httpMethod'] == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': ''
-        }
+    method = event['httpMethod']
+    if method == 'OPTIONS':
+        return POST_PREFLIGHT
     
-    if event['httpMethod'] != 'POST':
-        return {
-            'statusCode': 405,
-            'headers': headers,
-            'body': json.dumps({'error': 'Method not allowed'})
-        }
+    if method != 'POST':
+        return POST_METHOD_NOT_ALLOWED
+    
+    # Parse the request body once, before the handler's work begins
+    raw_body = event.get('body')
+    if raw_body:
+        try:
+            body = jloads(raw_body)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': jbody({'success': False, 'error': 'Invalid JSON body'})
+            }
+    else:
+        body = {}
     
     try:
-        # Parse request body
-        body = json.loads(event['body']) if event['body'] else {}
         url = body.get('url')
         
         if not url:
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'success': False, 'error': 'URL is required'})
+                'body': jbody({'success': False, 'error': 'URL is required'})
             }
         
         # Validate URL
-        if 'youtube.com' not in url and 'youtu.be' not in url:
+        if not YT_HOST_RE.search(url):
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'success': False, 'error': 'Invalid YouTube URL'})
+                'body': jbody({'success': False, 'error': 'Invalid YouTube URL'})
             }
         
         # Generate download ID
-        download_id = str(uuid.uuid4())
+        download_id = secrets.token_hex(16)
         
         # Get quality settings
         quality = body.get('quality', 'best')
@@ -70,83 +78,41 @@ def handler(event, context):
         else:
             format_selector = f'best[height<={quality}]/best' if quality.isdigit() else 'best'
         
-        # Prepare yt-dlp command for video info extraction
-        cmd = [
-            'yt-dlp',
-            '--print', '%(title)s',
-            '--print', '%(uploader)s', 
-            '--print', '%(duration)s',
-            '--print', '%(view_count)s',
-            '--no-download',
-            url
-        ]
-        
-        # Execute yt-dlp to get video info
+        # Extract video metadata in-process; no subprocess per request
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-            
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                title = lines[0] if len(lines) > 0 else 'Unknown Title'
-                uploader = lines[1] if len(lines) > 1 else 'Unknown Channel'
-                duration = lines[2] if len(lines) > 2 else '0'
-                views = lines[3] if len(lines) > 3 else '0'
-                
-                return {
-                    'statusCode': 200,
-                    'headers': headers,
-                    'body': json.dumps({
-                        'success': True,
-                        'data': {
-                            'downloadId': download_id,
-                            'status': 'analyzed',
-                            'title': title,
-                            'uploader': uploader,
-                            'duration': duration,
-                            'views': views,
-                            'message': 'Video analyzed successfully. Note: Actual downloading requires local setup due to Netlify limitations.',
-                            'downloadUrl': f'yt-dlp -f "{format_selector}" "{url}"'
-                        }
-                    })
-                }
-            else:
-                return {
-                    'statusCode': 400,
-                    'headers': headers,
-                    'body': json.dumps({
-                        'success': False,
-                        'error': f'Failed to analyze video: {result.stderr}'
-                    })
-                }
-                
-        except subprocess.TimeoutExpired:
+            with YoutubeDL(_YDL_OPTS) as ydl:
+                info = ydl.extract_info(url, download=False)
+
             return {
-                'statusCode': 408,
+                'statusCode': 200,
                 'headers': headers,
-                'body': json.dumps({
-                    'success': False,
-                    'error': 'Request timeout - video analysis took too long'
+                'body': jbody({
+                    'success': True,
+                    'data': {
+                        'downloadId': download_id,
+                        'status': 'analyzed',
+                        'title': info.get('title') or 'Unknown Title',
+                        'uploader': info.get('uploader') or 'Unknown Channel',
+                        'duration': str(info.get('duration') or 0),
+                        'views': str(info.get('view_count') or 0),
+                        'message': 'Video analyzed successfully. Note: Actual downloading requires local setup due to Netlify limitations.',
+                        'downloadUrl': f'yt-dlp -f "{format_selector}" "{url}"'
+                    }
                 })
             }
         except Exception as e:
             return {
-                'statusCode': 500,
+                'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({
+                'body': jbody({
                     'success': False,
-                    'error': f'Analysis error: {str(e)}'
+                    'error': f'Failed to analyze video: {str(e)}'
                 })
             }
     
-    except json.JSONDecodeError:
-        return {
-            'statusCode': 400,
-            'headers': headers,
-            'body': json.dumps({'success': False, 'error': 'Invalid JSON body'})
-        }
     except Exception as e:
         return {
             'statusCode': 500,
             'headers': headers,
-            'body': json.dumps({'success': False, 'error': f'Server error: {str(e)}'})
+            'body': jbody({'success': False, 'error': f'Server error: {str(e)}'})
         }
\ No newline at end of file
@@ -3,43 +3,43 @@ Netlify Function: Health Check
 Simple health check endpoint for the API
 """
 
-import json
+import time
 from datetime import datetime
 
+from _common import jbody, GET_HEADERS, GET_PREFLIGHT, GET_METHOD_NOT_ALLOWED
+
+# Everything except the timestamp is static; cache the serialized body
+# per whole second so bursts of health checks share one encode
+_STATIC_FIELDS = {
+    'status': 'healthy',
+    'version': '1.0.0',
+    'service': 'YouTube Downloader Pro - Serverless API',
+    'platform': 'Netlify Functions',
+    'note': 'This is a serverless API for video analysis. Actual downloads require local setup.'
+}
+_body_cache = (0, '')
+
 def handler(event, context):
     """Health check endpoint"""
     
-    headers = {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'GET, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type',
-        'Content-Type': 'application/json'
-    }
-    
     # Handle preflight OPTIONS request
-    if event['httpMethod'] == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': ''
-        }
+    method = event['httpMethod']
+    if method == 'OPTIONS':
+        return GET_PREFLIGHT
+    
+    if method != 'GET':
+        return GET_METHOD_NOT_ALLOWED
     
-    if event['httpMethod'] != 'GET':
-        return {
-            'statusCode': 405,
-            'headers': headers,
-            'body': json.dumps({'error': 'Method not allowed'})
-        }
+    global _body_cache
+    now = int(time.time())
+    if _body_cache[0] != now:
+        _body_cache = (now, jbody({
+            **_STATIC_FIELDS,
+            'timestamp': datetime.now().isoformat()
+        }))
     
     return {
         'statusCode': 200,
-        'headers': headers,
-        'body': json.dumps({
-            'status': 'healthy',
-            'timestamp': datetime.now().isoformat(),
-            'version': '1.0.0',
-            'service': 'YouTube Downloader Pro - Serverless API',
-            'platform': 'Netlify Functions',
-            'note': 'This is a serverless API for video analysis. Actual downloads require local setup.'
-        })
-    }
\ No newline at end of file
+        'headers': GET_HEADERS,
+        'body': _body_cache[1]
+    }
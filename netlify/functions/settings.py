@@ -3,49 +3,38 @@ Netlify Function: Get Settings
 Return default settings for the downloader
 """
 
-import json
+from _common import jbody, GET_HEADERS, GET_PREFLIGHT, GET_METHOD_NOT_ALLOWED
+
+# The payload is static, so serialize it once at import time
+_BODY = jbody({
+    'success': True,
+    'data': {
+        'quality': 'best',
+        'format': 'mp4',
+        'audioGuarantee': True,
+        'notifications': True,
+        'outputPath': 'downloads',
+        'maxConcurrentDownloads': 3,
+        'retryAttempts': 3,
+        'downloadTimeout': 300,
+        'serverType': 'netlify-serverless',
+        'note': 'Serverless API provides video analysis. Use local scripts for actual downloading.'
+    }
+})
 
 def handler(event, context):
     """Get downloader settings"""
     
-    headers = {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'GET, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type',
-        'Content-Type': 'application/json'
-    }
-    
     # Handle preflight OPTIONS request
-    if event['httpMethod'] == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': ''
-        }
+    method = event['httpMethod']
+    if method == 'OPTIONS':
+        return GET_PREFLIGHT
     
-    if event['httpMethod'] != 'GET':
-        return {
-            'statusCode': 405,
-            'headers': headers,
-            'body': json.dumps({'error': 'Method not allowed'})
-        }
+    if method != 'GET':
+        return GET_METHOD_NOT_ALLOWED
     
     return {
         'statusCode': 200,
-        'headers': headers,
-        'body': json.dumps({
-            'success': True,
-            'data': {
-                'quality': 'best',
-                'format': 'mp4',
-                'audioGuarantee': True,
-                'notifications': True,
-                'outputPath': 'downloads',
-                'maxConcurrentDownloads': 3,
-                'retryAttempts': 3,
-                'downloadTimeout': 300,
-                'serverType': 'netlify-serverless',
-                'note': 'Serverless API provides video analysis. Use local scripts for actual downloading.'
-            }
-        })
-    }
\ No newline at end of file
+        'headers': GET_HEADERS,
+        'body': _BODY
+    }
@@ -1,9 +1,14 @@
 """Progress tracking and notifications for YouTube Downloader."""
 
+import atexit
+import html as html_module
+import os
+import queue
 import smtplib
+import string
+import sys
 import time
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 from typing import Optional, Callable, Dict, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -17,8 +22,28 @@ try:
 except ImportError:
     tqdm = None
 
+try:
+    import orjson
+
+    def _dump_report(report: Dict[str, Any]) -> bytes:
+        """Serialize a report to indented JSON bytes."""
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2)
+except ImportError:
+    orjson = None
+
+    def _dump_report(report: Dict[str, Any]) -> bytes:
+        """Serialize a report to indented JSON bytes."""
+        return json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# Byte-size constants; multiplying by the reciprocal beats a division
+# on the hot speed path
+_MB = 1 << 20
+_GB = 1 << 30
+_INV_MB = 1.0 / _MB
 
-@dataclass
+
+@dataclass(slots=True)
 class DownloadStats:
     """Statistics for a download operation."""
     url: str
@@ -31,6 +56,8 @@ class DownloadStats:
     start_time: float = field(default_factory=time.time)
     end_time: Optional[float] = None
     error_message: Optional[str] = None
+    # Monotonic time of the last update forwarded to callbacks/renderer
+    _last_emit: float = field(default=0.0, repr=False)
     
     @property
     def progress_percentage(self) -> float:
@@ -48,7 +75,15 @@ class DownloadStats:
     @property
     def speed_mbps(self) -> float:
         """Get speed in MB/s."""
-        return self.speed / (1024 * 1024) if self.speed else 0.0
+        return self.speed * _INV_MB if self.speed else 0.0
+
+
+# Fields callers may set through update_progress; membership in a
+# frozenset is cheaper than hasattr and rejects private attributes
+_STATS_FIELDS = frozenset((
+    'filename', 'total_bytes', 'downloaded_bytes', 'speed', 'eta',
+    'status', 'error_message'
+))
 
 
 class ProgressTracker:
@@ -56,17 +91,80 @@ class ProgressTracker:
     
     def __init__(self, use_progress_bar: bool = True):
         self.downloads: Dict[str, DownloadStats] = {}
-        self.use_progress_bar = use_progress_bar and tqdm is not None
+        # Bars are pointless (and still cost I/O) when output is
+        # redirected to a file, CI log or service manager
+        self.use_progress_bar = (use_progress_bar and tqdm is not None
+                                 and sys.stderr.isatty())
         self.progress_bars: Dict[str, tqdm] = {}
-        self.callbacks: list = []
+        # Immutable tuple swapped on registration (rare) so dispatch
+        # reads it lock-free
+        self._callbacks: tuple = ()
+        # self.lock guards the dict structure (insert/remove); per-stat
+        # mutation takes only one of 8 shard locks keyed on download id,
+        # so concurrent downloads stop serializing on a single mutex
         self.lock = threading.Lock()
+        self._shards = [threading.Lock() for _ in range(8)]
+        # Running totals maintained incrementally on every mutation so
+        # get_overall_stats is O(1) instead of five O(N) scans
+        self._agg = {
+            'completed': 0,
+            'failed': 0,
+            'in_progress': 0,
+            'total_bytes': 0,
+            'downloaded_bytes': 0
+        }
+        self._agg_lock = threading.Lock()
+        # Bumped on every mutation; lets report consumers cache by
+        # version instead of re-aggregating unchanged state
+        self._version = 0
         self.logger = logging.getLogger(__name__)
+        # Progress bars are repainted by a single background thread at
+        # ~10 Hz instead of on every yt-dlp callback, so hot updates
+        # never pay for terminal writes
+        self._stop = False
+        self._wake = threading.Event()
+        self._renderer: Optional[threading.Thread] = None
+        if self.use_progress_bar:
+            self._renderer = threading.Thread(
+                target=self._render_loop, daemon=True, name='progress-render'
+            )
+            self._renderer.start()
+
+    def _render_loop(self):
+        """Repaint all active progress bars at a fixed interval."""
+        while not self._stop:
+            self._wake.wait(0.1)
+            self._wake.clear()
+            if self._stop:
+                break
+            try:
+                self._render_all()
+            except Exception as e:
+                self.logger.error(f"Progress render error: {e}")
+
+    def _render_all(self):
+        """Push current stats into every active progress bar."""
+        with self.lock:
+            items = list(self.progress_bars.items())
+        for download_id, pbar in items:
+            stats = self.downloads.get(download_id)
+            if stats is None:
+                continue
+            pbar.n = stats.progress_percentage
+            pbar.set_postfix({
+                'Speed': f"{stats.speed_mbps:.1f}MB/s",
+                'ETA': f"{stats.eta}s" if stats.eta else "N/A"
+            }, refresh=False)
+            # update(0) lets tqdm's own mininterval timer decide
+            # whether a terminal write actually happens
+            pbar.update(0)
     
     def add_download(self, download_id: str, url: str) -> DownloadStats:
         """Add a new download to track."""
         with self.lock:
             stats = DownloadStats(url=url)
             self.downloads[download_id] = stats
+            self._version += 1
             
             if self.use_progress_bar:
                 pbar = tqdm(
@@ -74,108 +172,217 @@ class ProgressTracker:
                     desc=f"Download {download_id[:8]}",
                     unit="%",
                     position=len(self.progress_bars),
-                    leave=True
+                    leave=True,
+                    mininterval=0.2,
+                    miniters=1
                 )
                 self.progress_bars[download_id] = pbar
             
             return stats
     
+    def _shard(self, download_id: str) -> threading.Lock:
+        """Pick the shard lock for a download id."""
+        return self._shards[hash(download_id) & 7]
+
     def update_progress(self, download_id: str, **kwargs):
         """Update progress for a download."""
-        with self.lock:
-            if download_id not in self.downloads:
-                return
-            
-            stats = self.downloads[download_id]
-            
-            # Update stats
+        stats = self.downloads.get(download_id)
+        if stats is None:
+            return
+
+        delta_bytes = delta_total = 0
+        with self._shard(download_id):
+            old_status = stats.status
+
+            # Update stats, capturing byte deltas for the aggregates
             for key, value in kwargs.items():
-                if hasattr(stats, key):
-                    setattr(stats, key, value)
-            
-            # Update progress bar
-            if self.use_progress_bar and download_id in self.progress_bars:
-                pbar = self.progress_bars[download_id]
-                pbar.n = stats.progress_percentage
-                pbar.set_postfix({
-                    'Speed': f"{stats.speed_mbps:.1f}MB/s",
-                    'ETA': f"{stats.eta}s" if stats.eta else "N/A"
-                })
-                pbar.refresh()
-            
-            # Trigger callbacks
-            for callback in self.callbacks:
-                try:
-                    callback(download_id, stats)
-                except Exception as e:
-                    self.logger.error(f"Progress callback error: {e}")
-    
+                if key not in _STATS_FIELDS:
+                    continue
+                if key == 'downloaded_bytes':
+                    delta_bytes = value - stats.downloaded_bytes
+                elif key == 'total_bytes':
+                    delta_total = value - stats.total_bytes
+                setattr(stats, key, value)
+
+            new_status = stats.status
+            self._version += 1
+
+        if delta_bytes or delta_total or new_status != old_status:
+            with self._agg_lock:
+                agg = self._agg
+                agg['downloaded_bytes'] += delta_bytes
+                agg['total_bytes'] += delta_total
+                if new_status != old_status:
+                    if old_status == 'downloading':
+                        agg['in_progress'] -= 1
+                    if new_status == 'downloading':
+                        agg['in_progress'] += 1
+
+        # Coalesce the per-chunk event stream: while downloading, only
+        # one update per 100 ms reaches the callbacks and renderer.
+        # Status changes always get through
+        now = time.monotonic()
+        if (new_status == 'downloading' and new_status == old_status
+                and now - stats._last_emit < 0.1):
+            return
+        stats._last_emit = now
+
+        # Nudge the renderer; the actual terminal write happens on
+        # its schedule, not here
+        if self.use_progress_bar:
+            self._wake.set()
+
+        # Trigger callbacks
+        for callback in self._callbacks:
+            try:
+                callback(download_id, stats)
+            except Exception as e:
+                self.logger.error(f"Progress callback error: {e}")
+
+    def update_from_ytdlp(self, download_id: str, downloaded_bytes: int,
+                          total_bytes: int, speed: float, eta: Optional[int],
+                          status: str):
+        """Fast path for the standard yt-dlp progress shape.
+
+        Assigns the five hot fields directly, skipping the kwargs dict
+        and the per-key whitelist walk of update_progress.
+        """
+        stats = self.downloads.get(download_id)
+        if stats is None:
+            return
+
+        with self._shard(download_id):
+            old_status = stats.status
+            delta_bytes = downloaded_bytes - stats.downloaded_bytes
+            delta_total = total_bytes - stats.total_bytes
+            stats.downloaded_bytes = downloaded_bytes
+            stats.total_bytes = total_bytes
+            stats.speed = speed
+            stats.eta = eta
+            stats.status = status
+            self._version += 1
+
+        if delta_bytes or delta_total or status != old_status:
+            with self._agg_lock:
+                agg = self._agg
+                agg['downloaded_bytes'] += delta_bytes
+                agg['total_bytes'] += delta_total
+                if status != old_status:
+                    if old_status == 'downloading':
+                        agg['in_progress'] -= 1
+                    if status == 'downloading':
+                        agg['in_progress'] += 1
+
+        now = time.monotonic()
+        if (status == 'downloading' and status == old_status
+                and now - stats._last_emit < 0.1):
+            return
+        stats._last_emit = now
+
+        if self.use_progress_bar:
+            self._wake.set()
+
+        for callback in self._callbacks:
+            try:
+                callback(download_id, stats)
+            except Exception as e:
+                self.logger.error(f"Progress callback error: {e}")
+
     def complete_download(self, download_id: str, success: bool = True, error: str = None):
         """Mark a download as completed."""
-        with self.lock:
-            if download_id not in self.downloads:
-                return
-            
-            stats = self.downloads[download_id]
+        stats = self.downloads.get(download_id)
+        if stats is None:
+            return
+
+        with self._shard(download_id):
+            old_status = stats.status
             stats.end_time = time.time()
             stats.status = "completed" if success else "failed"
-            
+
             if error:
                 stats.error_message = error
-            
-            # Close progress bar
-            if self.use_progress_bar and download_id in self.progress_bars:
-                pbar = self.progress_bars[download_id]
+            self._version += 1
+
+        with self._agg_lock:
+            if old_status == 'downloading':
+                self._agg['in_progress'] -= 1
+            self._agg['completed' if success else 'failed'] += 1
+
+        # Close progress bar
+        if self.use_progress_bar:
+            with self.lock:
+                pbar = self.progress_bars.pop(download_id, None)
+            if pbar is not None:
                 if success:
                     pbar.n = 100
                     pbar.set_postfix_str("✓ Completed")
                 else:
                     pbar.set_postfix_str("✗ Failed")
                 pbar.close()
-                del self.progress_bars[download_id]
-            
-            # Trigger callbacks
-            for callback in self.callbacks:
-                try:
-                    callback(download_id, stats)
-                except Exception as e:
-                    self.logger.error(f"Completion callback error: {e}")
+
+        # Trigger callbacks
+        for callback in self._callbacks:
+            try:
+                callback(download_id, stats)
+            except Exception as e:
+                self.logger.error(f"Completion callback error: {e}")
     
     def add_callback(self, callback: Callable[[str, DownloadStats], None]):
         """Add a progress callback function."""
-        self.callbacks.append(callback)
+        with self.lock:
+            self._callbacks = self._callbacks + (callback,)
     
     def get_overall_stats(self) -> Dict[str, Any]:
         """Get overall download statistics."""
-        with self.lock:
-            total_downloads = len(self.downloads)
-            completed = sum(1 for stats in self.downloads.values() if stats.status == "completed")
-            failed = sum(1 for stats in self.downloads.values() if stats.status == "failed")
-            in_progress = sum(1 for stats in self.downloads.values() if stats.status == "downloading")
-            
-            total_bytes = sum(stats.total_bytes for stats in self.downloads.values())
-            downloaded_bytes = sum(stats.downloaded_bytes for stats in self.downloads.values())
-            
-            overall_progress = (downloaded_bytes / total_bytes * 100) if total_bytes > 0 else 0
-            
-            return {
-                'total_downloads': total_downloads,
-                'completed': completed,
-                'failed': failed,
-                'in_progress': in_progress,
-                'overall_progress': overall_progress,
-                'total_bytes': total_bytes,
-                'downloaded_bytes': downloaded_bytes
-            }
+        with self._agg_lock:
+            snapshot = dict(self._agg)
+
+        total_bytes = snapshot['total_bytes']
+        downloaded_bytes = snapshot['downloaded_bytes']
+        snapshot['total_downloads'] = len(self.downloads)
+        snapshot['overall_progress'] = (
+            (downloaded_bytes / total_bytes * 100) if total_bytes > 0 else 0
+        )
+        return snapshot
     
     def cleanup(self):
-        """Clean up all progress bars."""
+        """Stop the renderer and clean up all progress bars."""
+        self._stop = True
+        self._wake.set()
+        if self._renderer is not None:
+            self._renderer.join(timeout=1)
         with self.lock:
             for pbar in self.progress_bars.values():
                 pbar.close()
             self.progress_bars.clear()
 
 
+# Notification bodies, compiled once; each send is a single substitute()
+# call instead of re-rendering a multi-line f-string
+_TPL_STARTED = string.Template("""
+        <h2>Download Started</h2>
+        <p><strong>Playlist URL:</strong> ${playlist_url}</p>
+        <p><strong>Video Count:</strong> ${video_count}</p>
+        <p><strong>Started At:</strong> ${timestamp}</p>
+        """)
+
+_TPL_COMPLETED = string.Template("""
+        <h2>Downloads Completed</h2>
+        <p><strong>Total Downloads:</strong> ${total_downloads}</p>
+        <p><strong>Successful:</strong> ${completed}</p>
+        <p><strong>Failed:</strong> ${failed}</p>
+        <p><strong>Success Rate:</strong> ${success_rate}%</p>
+        <p><strong>Total Size:</strong> ${total_gb} GB</p>
+        <p><strong>Completed At:</strong> ${timestamp}</p>
+        """)
+
+_TPL_FAILED = string.Template("""
+        <h2>Download Failed</h2>
+        <p><strong>Error:</strong> ${error_message}</p>
+        <p><strong>Time:</strong> ${timestamp}</p>
+        """)
+
+
 class EmailNotifier:
     """Handles email notifications for download events."""
     
@@ -188,36 +395,97 @@ class EmailNotifier:
         self.from_email = from_email
         self.to_email = to_email
         self.logger = logging.getLogger(__name__)
-    
+        # Persistent SMTP connection reused across notifications; the
+        # TCP + STARTTLS + AUTH handshake dominates a single send, so
+        # paying it once per session instead of once per email
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        self._base_headers = {'From': from_email, 'To': to_email}
+        # Sends run on a background worker so notify_* calls return
+        # immediately instead of blocking on the SMTP round trip
+        self._queue: queue.Queue = queue.Queue()
+        self._worker_thread = threading.Thread(
+            target=self._worker, daemon=True, name='email-notify'
+        )
+        self._worker_thread.start()
+        atexit.register(self.close)
+
+    def _worker(self):
+        """Drain queued notifications until the shutdown sentinel."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            subject, body, is_html = item
+            self._send_email_sync(subject, body, is_html)
+
+    def _get_server(self) -> smtplib.SMTP:
+        """Return a live SMTP connection, reconnecting if needed."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except smtplib.SMTPException:
+                pass
+            self._drop_connection()
+
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        server.starttls()
+        server.login(self.username, self.password)
+        self._smtp = server
+        return server
+
+    def _drop_connection(self):
+        """Discard the cached connection without raising."""
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+
+    def close(self):
+        """Flush pending notifications and close the SMTP connection."""
+        if self._worker_thread.is_alive():
+            self._queue.put(None)
+            self._worker_thread.join(timeout=30)
+        with self._smtp_lock:
+            self._drop_connection()
+
     def send_email(self, subject: str, body: str, is_html: bool = False):
-        """Send an email notification."""
+        """Queue an email notification for background delivery."""
+        self._queue.put((subject, body, is_html))
+
+    def _send_email_sync(self, subject: str, body: str, is_html: bool = False):
+        """Build and send an email on the worker thread."""
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.from_email
-            msg['To'] = self.to_email
+            msg = EmailMessage()
+            msg.update(self._base_headers)
             msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'html' if is_html else 'plain'))
-            
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
-            
+            msg.set_content(body, subtype='html' if is_html else 'plain')
+
+            with self._smtp_lock:
+                try:
+                    self._get_server().send_message(msg)
+                except smtplib.SMTPException:
+                    # Stale connection (idle timeout, server restart):
+                    # reconnect once and retry
+                    self._drop_connection()
+                    self._get_server().send_message(msg)
+
             self.logger.info(f"Email notification sent: {subject}")
-            
+
         except Exception as e:
             self.logger.error(f"Failed to send email notification: {e}")
     
     def notify_download_started(self, playlist_url: str, video_count: int):
         """Send notification when download starts."""
         subject = "YouTube Download Started"
-        body = f"""
-        <h2>Download Started</h2>
-        <p><strong>Playlist URL:</strong> {playlist_url}</p>
-        <p><strong>Video Count:</strong> {video_count}</p>
-        <p><strong>Started At:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        """
+        body = _TPL_STARTED.substitute(
+            playlist_url=playlist_url,
+            video_count=video_count,
+            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
         self.send_email(subject, body, is_html=True)
     
     def notify_download_completed(self, stats: Dict[str, Any]):
@@ -225,30 +493,97 @@ class EmailNotifier:
         subject = "YouTube Downloads Completed"
         
         success_rate = (stats['completed'] / stats['total_downloads'] * 100) if stats['total_downloads'] > 0 else 0
-        
-        body = f"""
-        <h2>Downloads Completed</h2>
-        <p><strong>Total Downloads:</strong> {stats['total_downloads']}</p>
-        <p><strong>Successful:</strong> {stats['completed']}</p>
-        <p><strong>Failed:</strong> {stats['failed']}</p>
-        <p><strong>Success Rate:</strong> {success_rate:.1f}%</p>
-        <p><strong>Total Size:</strong> {stats['total_bytes'] / (1024**3):.2f} GB</p>
-        <p><strong>Completed At:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        """
-        
+
+        body = _TPL_COMPLETED.substitute(
+            total_downloads=stats['total_downloads'],
+            completed=stats['completed'],
+            failed=stats['failed'],
+            success_rate=f"{success_rate:.1f}",
+            total_gb=f"{stats['total_bytes'] / _GB:.2f}",
+            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+
         self.send_email(subject, body, is_html=True)
     
     def notify_download_failed(self, error_message: str):
         """Send notification when download fails critically."""
         subject = "YouTube Download Failed"
-        body = f"""
-        <h2>Download Failed</h2>
-        <p><strong>Error:</strong> {error_message}</p>
-        <p><strong>Time:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        """
+        body = _TPL_FAILED.substitute(
+            error_message=error_message,
+            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
         self.send_email(subject, body, is_html=True)
 
 
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+# Static CSS block for HTML reports; lifted out so it is not
+# re-formatted on every call
+_REPORT_CSS = """
+                body { font-family: Arial, sans-serif; margin: 40px; }
+                .summary { background: #f5f5f5; padding: 20px; border-radius: 5px; margin-bottom: 20px; }
+                .downloads { margin-top: 20px; }
+                .download { border: 1px solid #ddd; padding: 15px; margin-bottom: 10px; border-radius: 5px; }
+                .completed { border-left: 5px solid #28a745; }
+                .failed { border-left: 5px solid #dc3545; }
+                .in-progress { border-left: 5px solid #ffc107; }
+                .progress-bar { background: #e9ecef; height: 20px; border-radius: 10px; overflow: hidden; }
+                .progress-fill { background: #007bff; height: 100%; transition: width 0.3s; }
+"""
+
+
+# Jinja2 compiles this once into a render function at import time;
+# autoescape covers filenames and error messages. Rendering falls back
+# to the hand-built fragment join when jinja2 is not installed
+_HTML_TEMPLATE = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>YouTube Download Report</title>
+            <style>{{ css }}</style>
+        </head>
+        <body>
+            <h1>YouTube Download Report</h1>
+            <div class="summary">
+                <h2>Summary</h2>
+                <p><strong>Generated:</strong> {{ report.timestamp }}</p>
+                <p><strong>Total Downloads:</strong> {{ report.summary.total_downloads }}</p>
+                <p><strong>Completed:</strong> {{ report.summary.completed }}</p>
+                <p><strong>Failed:</strong> {{ report.summary.failed }}</p>
+                <p><strong>In Progress:</strong> {{ report.summary.in_progress }}</p>
+                <p><strong>Total Size:</strong> {{ "%.2f"|format(report.summary.total_size_bytes / gb) }} GB</p>
+            </div>
+
+            <div class="downloads">
+                <h2>Download Details</h2>
+        {% for download in report.downloads %}
+                <div class="download {{ download.status.replace('_', '-') }}">
+                    <h3>{{ download.filename or download.id }}</h3>
+                    <p><strong>Status:</strong> {{ download.status.title() }}</p>
+                    <p><strong>Progress:</strong> {{ "%.1f"|format(download.progress_percentage) }}%</p>
+                    <div class="progress-bar">
+                        <div class="progress-fill" style="width: {{ download.progress_percentage }}%;"></div>
+                    </div>
+                    <p><strong>Size:</strong> {{ "%.1f"|format(download.total_bytes / mb) }} MB</p>
+                    <p><strong>Speed:</strong> {{ "%.1f"|format(download.speed_mbps) }} MB/s</p>
+                    <p><strong>Elapsed Time:</strong> {{ "%.1f"|format(download.elapsed_time_seconds) }}s</p>
+                    {% if download.error_message %}<p><strong>Error:</strong> {{ download.error_message }}</p>{% endif %}
+                </div>
+        {% endfor %}
+            </div>
+        </body>
+        </html>
+        """
+
+if jinja2 is not None:
+    _HTML_TPL = jinja2.Environment(autoescape=True).from_string(_HTML_TEMPLATE)
+else:
+    _HTML_TPL = None
+
+
 class StatusReporter:
     """Generates status reports and saves them to files."""
     
@@ -256,66 +591,100 @@ class StatusReporter:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.logger = logging.getLogger(__name__)
-    
-    def generate_report(self, downloads: Dict[str, DownloadStats]) -> Dict[str, Any]:
-        """Generate a comprehensive status report."""
-        report = {
-            'timestamp': datetime.now().isoformat(),
-            'summary': {
-                'total_downloads': len(downloads),
-                'completed': 0,
-                'failed': 0,
-                'in_progress': 0,
-                'total_size_bytes': 0,
-                'total_duration_seconds': 0
-            },
-            'downloads': []
-        }
-        
-        for download_id, stats in downloads.items():
-            # Update summary
-            if stats.status == 'completed':
-                report['summary']['completed'] += 1
-            elif stats.status == 'failed':
-                report['summary']['failed'] += 1
-            elif stats.status in ['downloading', 'starting']:
-                report['summary']['in_progress'] += 1
-            
-            report['summary']['total_size_bytes'] += stats.total_bytes
-            report['summary']['total_duration_seconds'] += stats.elapsed_time
-            
-            # Add download details
-            download_report = {
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_version = -1
+
+    def generate_report(self, downloads: Dict[str, DownloadStats],
+                        version: Optional[int] = None) -> Dict[str, Any]:
+        """Generate a comprehensive status report.
+
+        Pass the tracker's mutation counter as ``version`` to reuse the
+        previous report when nothing has changed — e.g. when saving
+        JSON and HTML back to back.
+        """
+        if version is not None and version == self._cached_version:
+            return self._cached
+        # Single tight pass with local counters and hoisted bindings;
+        # per-iteration dict indexing into the summary is the dominant
+        # interpreter cost on large playlists
+        completed = failed = in_progress = 0
+        total_bytes = 0
+        total_duration = 0.0
+        downloads_out = []
+        append = downloads_out.append
+        from_ts = datetime.fromtimestamp
+        now = time.time()
+
+        # Snapshot the dict items up front (O(N) pointer copy, atomic
+        # under the GIL) so the walk below tolerates concurrent
+        # add_download calls on the live tracker dict
+        for download_id, stats in list(downloads.items()):
+            status = stats.status
+            if status == 'completed':
+                completed += 1
+            elif status == 'failed':
+                failed += 1
+            elif status == 'downloading' or status == 'starting':
+                in_progress += 1
+
+            size = stats.total_bytes
+            end = stats.end_time
+            elapsed = (end or now) - stats.start_time
+            total_bytes += size
+            total_duration += elapsed
+
+            append({
                 'id': download_id,
                 'url': stats.url,
                 'filename': stats.filename,
-                'status': stats.status,
+                'status': status,
                 'progress_percentage': stats.progress_percentage,
-                'total_bytes': stats.total_bytes,
+                'total_bytes': size,
                 'downloaded_bytes': stats.downloaded_bytes,
                 'speed_mbps': stats.speed_mbps,
-                'elapsed_time_seconds': stats.elapsed_time,
-                'start_time': datetime.fromtimestamp(stats.start_time).isoformat(),
-                'end_time': datetime.fromtimestamp(stats.end_time).isoformat() if stats.end_time else None,
+                'elapsed_time_seconds': elapsed,
+                'start_time': from_ts(stats.start_time).isoformat(),
+                'end_time': from_ts(end).isoformat() if end else None,
                 'error_message': stats.error_message
-            }
-            report['downloads'].append(download_report)
-        
+            })
+
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'summary': {
+                'total_downloads': len(downloads),
+                'completed': completed,
+                'failed': failed,
+                'in_progress': in_progress,
+                'total_size_bytes': total_bytes,
+                'total_duration_seconds': total_duration
+            },
+            'downloads': downloads_out
+        }
+
+        if version is not None:
+            self._cached = report
+            self._cached_version = version
+
         return report
     
-    def save_report(self, downloads: Dict[str, DownloadStats], filename: str = None):
+    def save_report(self, downloads: Dict[str, DownloadStats], filename: str = None,
+                    version: Optional[int] = None):
         """Save status report to file."""
         if filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"download_report_{timestamp}.json"
-        
-        report = self.generate_report(downloads)
+
+        report = self.generate_report(downloads, version=version)
         report_path = self.output_dir / filename
         
         try:
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
-            
+            # Serialize to bytes in one shot (C encoder when orjson is
+            # installed), write to a sibling temp file and rename into
+            # place so readers never observe a partial report
+            tmp_path = report_path.with_suffix(report_path.suffix + '.tmp')
+            tmp_path.write_bytes(_dump_report(report))
+            os.replace(tmp_path, report_path)
+
             self.logger.info(f"Status report saved to: {report_path}")
             return report_path
             
@@ -323,81 +692,85 @@ class StatusReporter:
             self.logger.error(f"Failed to save status report: {e}")
             return None
     
-    def generate_html_report(self, downloads: Dict[str, DownloadStats]) -> str:
+    def generate_html_report(self, downloads: Dict[str, DownloadStats],
+                             version: Optional[int] = None) -> str:
         """Generate an HTML status report."""
-        report = self.generate_report(downloads)
-        
-        html = f"""
+        report = self.generate_report(downloads, version=version)
+
+        if _HTML_TPL is not None:
+            return _HTML_TPL.render(report=report, css=_REPORT_CSS, mb=_MB, gb=_GB)
+
+        summary = report['summary']
+        escape = html_module.escape
+
+        # Collect fragments and join once; += on a growing string is
+        # O(N^2) in total bytes for large reports
+        parts = [f"""
         <!DOCTYPE html>
         <html>
         <head>
             <title>YouTube Download Report</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                .summary {{ background: #f5f5f5; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-                .downloads {{ margin-top: 20px; }}
-                .download {{ border: 1px solid #ddd; padding: 15px; margin-bottom: 10px; border-radius: 5px; }}
-                .completed {{ border-left: 5px solid #28a745; }}
-                .failed {{ border-left: 5px solid #dc3545; }}
-                .in-progress {{ border-left: 5px solid #ffc107; }}
-                .progress-bar {{ background: #e9ecef; height: 20px; border-radius: 10px; overflow: hidden; }}
-                .progress-fill {{ background: #007bff; height: 100%; transition: width 0.3s; }}
-            </style>
+            <style>{_REPORT_CSS}</style>
         </head>
         <body>
             <h1>YouTube Download Report</h1>
             <div class="summary">
                 <h2>Summary</h2>
                 <p><strong>Generated:</strong> {report['timestamp']}</p>
-                <p><strong>Total Downloads:</strong> {report['summary']['total_downloads']}</p>
-                <p><strong>Completed:</strong> {report['summary']['completed']}</p>
-                <p><strong>Failed:</strong> {report['summary']['failed']}</p>
-                <p><strong>In Progress:</strong> {report['summary']['in_progress']}</p>
-                <p><strong>Total Size:</strong> {report['summary']['total_size_bytes'] / (1024**3):.2f} GB</p>
+                <p><strong>Total Downloads:</strong> {summary['total_downloads']}</p>
+                <p><strong>Completed:</strong> {summary['completed']}</p>
+                <p><strong>Failed:</strong> {summary['failed']}</p>
+                <p><strong>In Progress:</strong> {summary['in_progress']}</p>
+                <p><strong>Total Size:</strong> {summary['total_size_bytes'] / _GB:.2f} GB</p>
             </div>
-            
+
             <div class="downloads">
                 <h2>Download Details</h2>
-        """
-        
+        """]
+        append = parts.append
+
         for download in report['downloads']:
             status_class = download['status'].replace('_', '-')
-            html += f"""
+            error_message = download['error_message']
+            append(f"""
                 <div class="download {status_class}">
-                    <h3>{download['filename'] or download['id']}</h3>
+                    <h3>{escape(download['filename'] or download['id'])}</h3>
                     <p><strong>Status:</strong> {download['status'].title()}</p>
                     <p><strong>Progress:</strong> {download['progress_percentage']:.1f}%</p>
                     <div class="progress-bar">
                         <div class="progress-fill" style="width: {download['progress_percentage']}%;"></div>
                     </div>
-                    <p><strong>Size:</strong> {download['total_bytes'] / (1024**2):.1f} MB</p>
+                    <p><strong>Size:</strong> {download['total_bytes'] / _MB:.1f} MB</p>
                     <p><strong>Speed:</strong> {download['speed_mbps']:.1f} MB/s</p>
                     <p><strong>Elapsed Time:</strong> {download['elapsed_time_seconds']:.1f}s</p>
-                    {f"<p><strong>Error:</strong> {download['error_message']}</p>" if download['error_message'] else ""}
+                    {f"<p><strong>Error:</strong> {escape(error_message)}</p>" if error_message else ""}
                 </div>
-            """
-        
-        html += """
+            """)
+
+        append("""
             </div>
         </body>
         </html>
-        """
-        
-        return html
+        """)
+
+        return "".join(parts)
     
-    def save_html_report(self, downloads: Dict[str, DownloadStats], filename: str = None):
+    def save_html_report(self, downloads: Dict[str, DownloadStats], filename: str = None,
+                         version: Optional[int] = None):
         """Save HTML status report to file."""
         if filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"download_report_{timestamp}.html"
-        
-        html = self.generate_html_report(downloads)
+
+        html = self.generate_html_report(downloads, version=version)
         report_path = self.output_dir / filename
         
         try:
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(html)
-            
+            # Same atomic write-then-rename as the JSON report
+            tmp_path = report_path.with_suffix(report_path.suffix + '.tmp')
+            tmp_path.write_bytes(html.encode('utf-8'))
+            os.replace(tmp_path, report_path)
+
             self.logger.info(f"HTML report saved to: {report_path}")
             return report_path
             
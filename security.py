@@ -1,10 +1,12 @@
 """Security and validation utilities for YouTube Downloader."""
 
+import os
 import re
+import shutil
 import time
 import hashlib
-import hmac
-from urllib.parse import urlparse, parse_qs
+from collections import deque
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Set
 from pathlib import Path
 import logging
@@ -34,6 +36,9 @@ class SecurityConfig:
             ]
         if self.blocked_domains is None:
             self.blocked_domains = []
+        # Frozensets give O(1) membership on the per-URL hot path
+        self.allowed_domains = frozenset(self.allowed_domains)
+        self.blocked_domains = frozenset(self.blocked_domains)
 
 
 class URLValidator:
@@ -48,37 +53,134 @@ class URLValidator:
         r'^https?://(www\.)?youtube\.com/user/[\w-]+',
         r'^https?://music\.youtube\.com/',
     ]
-    
+
+    # Exact prefixes covering the overwhelmingly common URL shapes; a
+    # C-level startswith here skips domain parsing and regex entirely
+    _FAST_VALID_PREFIXES = (
+        'https://www.youtube.com/watch?v=',
+        'https://www.youtube.com/playlist?list=',
+        'https://youtu.be/',
+    )
+
+    # Character trie over every literal prefix the seven patterns
+    # accept (scheme/www variants included). One walk decides which
+    # shape matched and where its ID suffix starts, without entering
+    # the regex VM; each step is a C dict probe. The boolean terminal
+    # marks whether at least one ID character must follow
+    _PREFIX_SHAPES = tuple(
+        (f'{scheme}://{www}youtube.com/{tail}', True)
+        for scheme in ('https', 'http')
+        for www in ('www.', '')
+        for tail in ('watch?v=', 'playlist?list=', 'c/', 'channel/', 'user/')
+    ) + tuple(
+        (f'{scheme}://{host}', needs_id)
+        for scheme in ('https', 'http')
+        for host, needs_id in (('youtu.be/', True), ('music.youtube.com/', False))
+    )
+
+    _PREFIX_TRIE: dict = {}
+    for _prefix, _needs_id in _PREFIX_SHAPES:
+        _node = _PREFIX_TRIE
+        for _ch in _prefix:
+            _node = _node.setdefault(_ch, {})
+        _node['$'] = _needs_id
+    del _prefix, _needs_id, _node, _ch
+
+    _ID_CHAR_RE = re.compile(r'[\w-]')
+
+    # The trie bakes in the stock domains, so it is only sound while
+    # the config still uses them
+    _DEFAULT_DOMAINS = frozenset({
+        'youtube.com', 'youtu.be', 'm.youtube.com',
+        'music.youtube.com', 'www.youtube.com'
+    })
+
+    @classmethod
+    def _match_known_shape(cls, url: str) -> Optional[bool]:
+        """Walk the prefix trie; True/False for a decided URL, None to
+        fall through to the slow path."""
+        node = cls._PREFIX_TRIE
+        pos = 0
+        for ch in url:
+            done = node.get('$')
+            if done is not None:
+                break
+            node = node.get(ch)
+            if node is None:
+                return None
+            pos += 1
+        else:
+            done = node.get('$')
+            if done is None:
+                return None
+
+        if done:  # shape requires an ID character after the prefix
+            return bool(cls._ID_CHAR_RE.match(url, pos))
+        return True
+
     def __init__(self, security_config: SecurityConfig):
         self.config = security_config
         self.logger = logging.getLogger(__name__)
-    
+        # Per-instance regex fusing the domain allow-list into the
+        # shape alternation: one anchored .match replaces the
+        # partition/lower/frozenset dance plus a second regex call
+        self._valid_re = self._build_valid_re(security_config)
+        self._fast_path_ok = (security_config.allowed_domains == self._DEFAULT_DOMAINS
+                              and not security_config.blocked_domains)
+        # Per-instance memo: playlists re-validate the same URLs (once
+        # for the playlist, again per derived video); repeat checks
+        # become a dict hit instead of parsing plus regex
+        self._is_valid_cached = lru_cache(maxsize=2048)(self._is_valid_uncached)
+
+    @staticmethod
+    def _build_valid_re(config: SecurityConfig) -> Optional[re.Pattern]:
+        """Compile one anchored regex accepting exactly the URL shapes
+        whose domain survives the allow/block lists."""
+        allowed = config.allowed_domains - config.blocked_domains
+        bare = 'youtube.com' in allowed
+        www = 'www.youtube.com' in allowed
+        parts = []
+        if bare or www:
+            if bare and www:
+                host = r'(?:www\.)?youtube\.com'
+            elif www:
+                host = r'www\.youtube\.com'
+            else:
+                host = r'youtube\.com'
+            parts.extend(
+                rf'^https?://{host}/{tail}'
+                for tail in (r'watch\?v=[\w-]+', r'playlist\?list=[\w-]+',
+                             r'c/[\w-]+', r'channel/[\w-]+', r'user/[\w-]+')
+            )
+        if 'youtu.be' in allowed:
+            parts.append(r'^https?://youtu\.be/[\w-]+')
+        if 'music.youtube.com' in allowed:
+            parts.append(r'^https?://music\.youtube\.com/')
+        if not parts:
+            return None
+        return re.compile('|'.join(f'(?:{p})' for p in parts), re.IGNORECASE)
+
     def is_valid_youtube_url(self, url: str) -> bool:
         """Check if URL is a valid YouTube URL."""
         if not self.config.enable_url_validation:
             return True
-        
+        return self._is_valid_cached(url)
+
+    def _is_valid_uncached(self, url: str) -> bool:
+        """Validate a URL; results are memoized per instance."""
         try:
-            parsed = urlparse(url)
-            
-            # Check domain
-            domain = parsed.netloc.lower()
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            
-            if domain not in self.config.allowed_domains:
-                self.logger.warning(f"Domain not in allowed list: {domain}")
-                return False
-            
-            if domain in self.config.blocked_domains:
-                self.logger.warning(f"Domain is blocked: {domain}")
-                return False
-            
-            # Check URL pattern
-            for pattern in self.YOUTUBE_URL_PATTERNS:
-                if re.match(pattern, url, re.IGNORECASE):
-                    return True
-            
+            # Fast path: one trie walk decides every known-good shape
+            # (only safe while the stock domain lists are in effect)
+            if len(url) < 2048 and self._fast_path_ok:
+                decided = self._match_known_shape(url)
+                if decided is not None:
+                    return decided
+
+            # The fused regex already embeds the allow/block lists, so
+            # no domain extraction happens here at all
+            if self._valid_re is not None and self._valid_re.match(url):
+                return True
+
             self.logger.warning(f"URL doesn't match valid YouTube patterns: {url}")
             return False
             
@@ -86,60 +188,67 @@ class URLValidator:
             self.logger.error(f"Error validating URL {url}: {e}")
             return False
     
+    # Query parameters allowed to survive sanitization
+    _SAFE_QUERY_KEYS = frozenset({'v', 'list', 't', 'index', 'start', 'end'})
+
     def sanitize_url(self, url: str) -> str:
         """Sanitize and normalize a YouTube URL."""
         try:
-            parsed = urlparse(url)
-            
-            # Remove potentially harmful parameters
-            safe_params = ['v', 'list', 't', 'index', 'start', 'end']
-            query_params = parse_qs(parsed.query)
-            sanitized_params = {k: v for k, v in query_params.items() if k in safe_params}
-            
-            # Rebuild query string
-            query_parts = []
-            for key, values in sanitized_params.items():
-                for value in values:
-                    query_parts.append(f"{key}={value}")
-            
-            sanitized_query = "&".join(query_parts)
-            
-            # Rebuild URL
-            sanitized_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            if sanitized_query:
-                sanitized_url += f"?{sanitized_query}"
-            
-            return sanitized_url
-            
+            # Drop the fragment, then filter the query by key with two
+            # partitions per parameter; parse_qs would percent-decode
+            # and build a dict of lists only to be thrown away
+            base, _, query = url.partition('#')[0].partition('?')
+            if not query:
+                return base
+
+            safe_keys = self._SAFE_QUERY_KEYS
+            kept = [part for part in query.split('&')
+                    if part.partition('=')[0] in safe_keys]
+
+            if kept:
+                return f"{base}?{'&'.join(kept)}"
+            return base
+
         except Exception as e:
             self.logger.error(f"Error sanitizing URL {url}: {e}")
             return url
     
     def extract_video_id(self, url: str) -> Optional[str]:
         """Extract video ID from YouTube URL."""
-        try:
-            parsed = urlparse(url)
-            
-            if 'youtu.be' in parsed.netloc:
-                return parsed.path[1:]  # Remove leading slash
-            
-            query_params = parse_qs(parsed.query)
-            return query_params.get('v', [None])[0]
-            
-        except Exception as e:
-            self.logger.error(f"Error extracting video ID from {url}: {e}")
-            return None
-    
+        return _extract_video_id(url)
+
     def extract_playlist_id(self, url: str) -> Optional[str]:
         """Extract playlist ID from YouTube URL."""
-        try:
-            parsed = urlparse(url)
-            query_params = parse_qs(parsed.query)
-            return query_params.get('list', [None])[0]
-            
-        except Exception as e:
-            self.logger.error(f"Error extracting playlist ID from {url}: {e}")
-            return None
+        return _extract_playlist_id(url)
+
+
+# Targeted scans for the single key each extractor needs; parse_qs
+# decodes and dict-ifies every parameter just to be discarded
+_VID_RE = re.compile(r'[?&]v=([\w-]+)')
+_LIST_RE = re.compile(r'[?&]list=([\w-]+)')
+
+
+# Pure functions of the URL, so module-level memoization is safe
+@lru_cache(maxsize=4096)
+def _extract_video_id(url: str) -> Optional[str]:
+    """Extract the video ID from a YouTube URL."""
+    match = _VID_RE.search(url)
+    if match:
+        return match.group(1)
+
+    if 'youtu.be/' in url:
+        tail = url.partition('youtu.be/')[2]
+        video_id = tail.partition('?')[0]
+        return video_id or None
+
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _extract_playlist_id(url: str) -> Optional[str]:
+    """Extract the playlist ID from a YouTube URL."""
+    match = _LIST_RE.search(url)
+    return match.group(1) if match else None
 
 
 class PathSanitizer:
@@ -147,11 +256,14 @@ class PathSanitizer:
     
     # Characters that are not allowed in filenames
     FORBIDDEN_CHARS = r'<>:"/\\|?*'
-    FORBIDDEN_NAMES = {
+    # Translation table mapping every forbidden character to '_'; a
+    # single C-level translate pass with no regex machinery at all
+    _TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+    FORBIDDEN_NAMES = frozenset({
         'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4', 'COM5',
         'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2', 'LPT3', 'LPT4',
         'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-    }
+    })
     
     def __init__(self, security_config: SecurityConfig):
         self.config = security_config
@@ -164,23 +276,25 @@ class PathSanitizer:
         
         try:
             # Remove or replace forbidden characters
-            sanitized = filename
-            for char in self.FORBIDDEN_CHARS:
-                sanitized = sanitized.replace(char, '_')
+            sanitized = filename.translate(self._TRANS)
             
             # Remove leading/trailing whitespace and dots
             sanitized = sanitized.strip(' .')
             
-            # Check for forbidden names
-            name_part = sanitized.split('.')[0].upper()
+            # Check for forbidden names; partition avoids building a
+            # throwaway list of every dot-separated piece
+            name_part = sanitized.partition('.')[0].upper()
             if name_part in self.FORBIDDEN_NAMES:
                 sanitized = f"file_{sanitized}"
             
-            # Truncate if too long
+            # Truncate if too long; rpartition scans once instead of
+            # the separate 'in' test plus rsplit
             if len(sanitized) > max_length:
-                name, ext = sanitized.rsplit('.', 1) if '.' in sanitized else (sanitized, '')
-                max_name_len = max_length - len(ext) - 1 if ext else max_length
-                sanitized = name[:max_name_len] + (f".{ext}" if ext else "")
+                name, sep, ext = sanitized.rpartition('.')
+                if sep:
+                    sanitized = name[:max_length - len(ext) - 1] + f".{ext}"
+                else:
+                    sanitized = sanitized[:max_length]
             
             # Ensure it's not empty
             if not sanitized:
@@ -195,28 +309,36 @@ class PathSanitizer:
     def sanitize_path(self, path: str, base_path: Optional[str] = None) -> str:
         """Sanitize a complete file path."""
         try:
-            path_obj = Path(path)
-            
-            # Sanitize each part of the path
-            sanitized_parts = []
-            for part in path_obj.parts:
-                sanitized_parts.append(self.sanitize_filename(part))
-            
-            sanitized_path = Path(*sanitized_parts)
-            
-            # Ensure path is within base directory if specified
+            # One fused pass: split on either separator, translate each
+            # component in C and join — no Path objects, no tuple of
+            # parts, no per-component method dispatch
+            components = []
+            for part in path.replace('\\', '/').split('/'):
+                if not part:
+                    continue
+                clean = part.translate(self._TRANS).strip(' .')
+                if not clean:
+                    clean = 'unnamed'
+                elif clean.partition('.')[0].upper() in self.FORBIDDEN_NAMES:
+                    clean = f"file_{clean}"
+                components.append(clean)
+
+            sanitized = os.sep.join(components) if components else 'sanitized_file'
+
+            # Ensure path is within base directory if specified;
+            # normpath + prefix compare stays in userspace, unlike
+            # resolve() which stats every component
             if base_path:
-                base_path_obj = Path(base_path).resolve()
-                try:
-                    sanitized_path = base_path_obj / sanitized_path
-                    sanitized_path.resolve().relative_to(base_path_obj)
-                except ValueError:
+                base_norm = os.path.normpath(base_path)
+                candidate = os.path.normpath(os.path.join(base_norm, sanitized))
+                if candidate != base_norm and not candidate.startswith(base_norm + os.sep):
                     # Path tries to escape base directory
                     self.logger.warning(f"Path tries to escape base directory: {path}")
-                    sanitized_path = base_path_obj / self.sanitize_filename(path_obj.name)
-            
-            return str(sanitized_path)
-            
+                    candidate = os.path.join(base_norm, components[-1] if components else 'sanitized_file')
+                return candidate
+
+            return sanitized
+
         except Exception as e:
             self.logger.error(f"Error sanitizing path {path}: {e}")
             return str(Path(base_path or ".") / "sanitized_file")
@@ -227,9 +349,40 @@ class RateLimiter:
     
     def __init__(self, security_config: SecurityConfig):
         self.config = security_config
-        self.requests = {}  # IP -> list of timestamps
-        self.lock = threading.Lock()
+        # IP -> deque of timestamps, oldest first; expiry pops from the
+        # left instead of rebuilding a list per request
+        self.requests: Dict[str, deque] = {}
+        # 16 striped locks keyed on the identifier hash, so requests
+        # from unrelated identifiers never contend on one mutex
+        self._locks = [threading.Lock() for _ in range(16)]
+        self._max_per_hour = security_config.max_downloads_per_hour
         self.logger = logging.getLogger(__name__)
+        # Background sweeper prunes identifiers whose whole window has
+        # expired, so the request path never pays for global cleanup
+        # and the table stays bounded under identifier churn
+        self._stopped = threading.Event()
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop, daemon=True, name='ratelimit-sweep'
+        )
+        self._sweeper.start()
+
+    def _sweep_loop(self):
+        """Prune fully-expired identifiers every 60 seconds."""
+        while not self._stopped.wait(60):
+            hour_ago = time.time() - 3600
+            for identifier in list(self.requests):
+                with self._lock_for(identifier):
+                    dq = self.requests.get(identifier)
+                    if dq is None:
+                        continue
+                    while dq and dq[0] <= hour_ago:
+                        dq.popleft()
+                    if not dq:
+                        del self.requests[identifier]
+
+    def close(self):
+        """Stop the background sweeper."""
+        self._stopped.set()
     
     def is_allowed(self, identifier: str = "default") -> bool:
         """Check if request is allowed based on rate limiting."""
@@ -238,48 +391,72 @@ class RateLimiter:
         
         current_time = time.time()
         hour_ago = current_time - 3600  # 1 hour
-        
-        with self.lock:
-            # Clean old requests
-            if identifier in self.requests:
-                self.requests[identifier] = [
-                    ts for ts in self.requests[identifier] if ts > hour_ago
-                ]
-            else:
-                self.requests[identifier] = []
-            
+
+        with self._lock_for(identifier):
+            # Evict expired timestamps from the left; amortized O(1)
+            dq = self.requests.setdefault(identifier, deque())
+            while dq and dq[0] <= hour_ago:
+                dq.popleft()
+
             # Check rate limit
-            if len(self.requests[identifier]) >= self.config.max_downloads_per_hour:
+            if len(dq) >= self._max_per_hour:
                 self.logger.warning(f"Rate limit exceeded for {identifier}")
                 return False
-            
+
             # Record this request
-            self.requests[identifier].append(current_time)
+            dq.append(current_time)
             return True
     
     def get_remaining_requests(self, identifier: str = "default") -> int:
         """Get number of remaining requests for identifier."""
         current_time = time.time()
         hour_ago = current_time - 3600
-        
-        with self.lock:
-            if identifier not in self.requests:
-                return self.config.max_downloads_per_hour
-            
-            # Count recent requests
-            recent_requests = [
-                ts for ts in self.requests[identifier] if ts > hour_ago
-            ]
-            
-            return max(0, self.config.max_downloads_per_hour - len(recent_requests))
+
+        with self._lock_for(identifier):
+            dq = self.requests.get(identifier)
+            if dq is None:
+                return self._max_per_hour
+
+            while dq and dq[0] <= hour_ago:
+                dq.popleft()
+
+            return max(0, self._max_per_hour - len(dq))
     
+    def _lock_for(self, identifier: str) -> threading.Lock:
+        """Pick the striped lock for an identifier."""
+        return self._locks[hash(identifier) & 15]
+
     def reset_limits(self, identifier: str = None):
         """Reset rate limits for specific identifier or all."""
-        with self.lock:
-            if identifier:
+        if identifier:
+            with self._lock_for(identifier):
                 self.requests.pop(identifier, None)
-            else:
-                self.requests.clear()
+            return
+
+        # Take every stripe in index order (deadlock-safe) before
+        # clearing the whole table
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            self.requests.clear()
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+
+if hasattr(os, 'statvfs'):
+    def _free_bytes(path: Path) -> int:
+        """Free bytes on the filesystem holding path.
+
+        One raw statvfs call; shutil.disk_usage wraps the same syscall
+        but builds a named tuple with two fields we never read.
+        """
+        st = os.statvfs(path)
+        return st.f_bavail * st.f_frsize
+else:  # Windows has no statvfs
+    def _free_bytes(path: Path) -> int:
+        """Free bytes on the filesystem holding path."""
+        return shutil.disk_usage(path).free
 
 
 class FileSizeValidator:
@@ -287,13 +464,22 @@ class FileSizeValidator:
     
     def __init__(self, security_config: SecurityConfig):
         self.config = security_config
+        # Config is fixed after construction; precompute the byte limit
+        # so each check is a single integer compare
+        self._max_size_bytes = int(security_config.max_file_size_gb * (1 << 30))
+        # Per-directory free-space snapshots plus a running reservation
+        # for downloads validated against them; a playlist targeting
+        # one directory then costs ~1 statvfs per 5 s instead of one
+        # syscall per video
+        self._disk_cache: Dict[Path, tuple] = {}
+        self._reserved: Dict[Path, int] = {}
+        self._ensured_dirs: Set[Path] = set()
+        self._cache_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
     
     def is_size_allowed(self, size_bytes: int) -> bool:
         """Check if file size is within allowed limits."""
-        max_size = self.config.max_file_size_gb * 1024 * 1024 * 1024  # Convert to bytes
-        
-        if size_bytes > max_size:
+        if size_bytes > self._max_size_bytes:
             self.logger.warning(
                 f"File size {size_bytes / (1024**3):.2f}GB exceeds limit "
                 f"of {self.config.max_file_size_gb}GB"
@@ -307,34 +493,56 @@ class FileSizeValidator:
         try:
             path_obj = Path(path)
             parent_dir = path_obj.parent if path_obj.is_file() else path_obj
-            
-            if not parent_dir.exists():
+
+            if parent_dir not in self._ensured_dirs:
                 parent_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Get available disk space
-            statvfs = parent_dir.stat() if hasattr(parent_dir, 'stat') else None
-            
-            # For Windows, we'll use a simplified check
-            import shutil
-            free_bytes = shutil.disk_usage(parent_dir).free
-            
+                self._ensured_dirs.add(parent_dir)
+
             # Add 10% buffer for safety
-            required_with_buffer = required_bytes * 1.1
-            
-            if free_bytes < required_with_buffer:
-                self.logger.error(
-                    f"Insufficient disk space. Required: {required_with_buffer / (1024**3):.2f}GB, "
-                    f"Available: {free_bytes / (1024**3):.2f}GB"
-                )
-                return False
-            
-            return True
-            
+            required_with_buffer = int(required_bytes * 1.1)
+            now = time.monotonic()
+
+            with self._cache_lock:
+                cached = self._disk_cache.get(parent_dir)
+                if cached is not None and now - cached[0] < 5.0:
+                    reserved = self._reserved.get(parent_dir, 0)
+                    if cached[1] - reserved >= required_with_buffer:
+                        self._reserved[parent_dir] = reserved + required_with_buffer
+                        return True
+                    # Fall through and re-stat; the cached snapshot may
+                    # simply be stale
+
+                free_bytes = _free_bytes(parent_dir)
+                self._disk_cache[parent_dir] = (now, free_bytes)
+                self._reserved[parent_dir] = 0
+
+                if free_bytes < required_with_buffer:
+                    self.logger.error(
+                        f"Insufficient disk space. Required: {required_with_buffer / (1024**3):.2f}GB, "
+                        f"Available: {free_bytes / (1024**3):.2f}GB"
+                    )
+                    return False
+
+                self._reserved[parent_dir] = required_with_buffer
+                return True
+
         except Exception as e:
             self.logger.error(f"Error checking disk space: {e}")
             return False  # Fail safe
 
 
+@lru_cache(maxsize=4096)
+def _hash_suffix(video_id: str) -> str:
+    """Short filename-disambiguation hash for a video id.
+
+    blake2b at digest_size=4 produces exactly the 8 hex chars needed,
+    cheaper than computing a full SHA-256 and truncating; this is not
+    a cryptographic integrity check. Cached since retries re-hash the
+    same id.
+    """
+    return hashlib.blake2b(video_id.encode('utf-8'), digest_size=4).hexdigest()
+
+
 class SecurityManager:
     """Main security manager that coordinates all security features."""
     
@@ -348,9 +556,11 @@ class SecurityManager:
         self.rate_limiter = RateLimiter(self.config)
         self.file_size_validator = FileSizeValidator(self.config)
         
-        # Track active connections
+        # Track active connections; counters are guarded by 8 striped
+        # locks so unrelated identifiers never contend, and readers
+        # take GIL-atomic snapshots without locking at all
         self.active_connections: Dict[str, int] = {}
-        self.connection_lock = threading.Lock()
+        self._conn_locks = [threading.Lock() for _ in range(8)]
     
     def validate_download_request(self, url: str, output_path: str, 
                                 identifier: str = "default") -> Dict[str, Any]:
@@ -366,30 +576,33 @@ class SecurityManager:
         }
         
         try:
+            # Fail fast, cheapest checks first: a rejected request
+            # should not pay for URL parsing or path sanitization.
+            # Concurrent connections; a plain dict .get is atomic
+            # under the GIL, no lock needed for the read
+            if self.active_connections.get(identifier, 0) >= self.config.max_concurrent_ips:
+                results['allowed'] = False
+                results['errors'].append("Too many concurrent connections")
+                return results
+
+            # Check rate limits
+            if not self.rate_limiter.is_allowed(identifier):
+                results['rate_limit_ok'] = False
+                results['allowed'] = False
+                results['errors'].append("Rate limit exceeded")
+                return results
+
             # Validate URL
             if not self.url_validator.is_valid_youtube_url(url):
                 results['url_valid'] = False
                 results['allowed'] = False
                 results['errors'].append("Invalid or unsafe URL")
-            else:
-                results['sanitized_url'] = self.url_validator.sanitize_url(url)
-            
+                return results
+            results['sanitized_url'] = self.url_validator.sanitize_url(url)
+
             # Sanitize path
             results['sanitized_path'] = self.path_sanitizer.sanitize_path(output_path)
-            
-            # Check rate limits
-            if not self.rate_limiter.is_allowed(identifier):
-                results['rate_limit_ok'] = False
-                results['allowed'] = False
-                results['errors'].append("Rate limit exceeded")
-            
-            # Check concurrent connections
-            with self.connection_lock:
-                current_connections = self.active_connections.get(identifier, 0)
-                if current_connections >= self.config.max_concurrent_ips:
-                    results['allowed'] = False
-                    results['errors'].append("Too many concurrent connections")
-            
+
         except Exception as e:
             self.logger.error(f"Error validating download request: {e}")
             results['allowed'] = False
@@ -397,18 +610,23 @@ class SecurityManager:
         
         return results
     
+    def _conn_lock(self, identifier: str) -> threading.Lock:
+        """Pick the striped lock for a connection identifier."""
+        return self._conn_locks[hash(identifier) & 7]
+
     def register_connection(self, identifier: str):
         """Register a new connection."""
-        with self.connection_lock:
+        with self._conn_lock(identifier):
             self.active_connections[identifier] = self.active_connections.get(identifier, 0) + 1
-    
+
     def unregister_connection(self, identifier: str):
         """Unregister a connection."""
-        with self.connection_lock:
-            if identifier in self.active_connections:
-                self.active_connections[identifier] -= 1
-                if self.active_connections[identifier] <= 0:
-                    del self.active_connections[identifier]
+        with self._conn_lock(identifier):
+            count = self.active_connections.get(identifier, 0) - 1
+            if count > 0:
+                self.active_connections[identifier] = count
+            else:
+                self.active_connections.pop(identifier, None)
     
     def check_file_size_before_download(self, estimated_size: int, output_path: str) -> bool:
         """Check if file size and disk space are acceptable."""
@@ -423,30 +641,39 @@ class SecurityManager:
     def generate_secure_filename(self, original_name: str, video_id: str) -> str:
         """Generate a secure filename with hash verification."""
         sanitized_name = self.path_sanitizer.sanitize_filename(original_name)
-        
+
         # Add hash of video ID for integrity checking
-        hash_suffix = hashlib.sha256(video_id.encode()).hexdigest()[:8]
-        name_part, ext = sanitized_name.rsplit('.', 1) if '.' in sanitized_name else (sanitized_name, '')
-        
-        secure_name = f"{name_part}_{hash_suffix}"
-        if ext:
-            secure_name += f".{ext}"
-        
-        return secure_name
+        hash_suffix = _hash_suffix(video_id)
+        name_part, sep, ext = sanitized_name.rpartition('.')
+        if sep:
+            return f"{name_part}_{hash_suffix}.{ext}"
+        return f"{sanitized_name}_{hash_suffix}"
     
+    def clear_url_cache(self):
+        """Drop memoized URL results after a config change."""
+        validator = self.url_validator
+        validator._valid_re = URLValidator._build_valid_re(self.config)
+        validator._fast_path_ok = (self.config.allowed_domains == URLValidator._DEFAULT_DOMAINS
+                                   and not self.config.blocked_domains)
+        validator._is_valid_cached.cache_clear()
+        _extract_video_id.cache_clear()
+        _extract_playlist_id.cache_clear()
+
     def log_security_event(self, event_type: str, details: Dict[str, Any]):
         """Log security-related events for monitoring."""
         self.logger.warning(f"Security event [{event_type}]: {details}")
     
     def get_security_stats(self) -> Dict[str, Any]:
         """Get current security statistics."""
-        with self.connection_lock:
-            return {
-                'active_connections': dict(self.active_connections),
-                'total_active': sum(self.active_connections.values()),
+        # dict() over a dict is a GIL-atomic snapshot; stats tolerate
+        # being a moment stale, so no stripe needs to be held
+        connections = dict(self.active_connections)
+        return {
+                'active_connections': connections,
+                'total_active': sum(connections.values()),
                 'rate_limits': {
                     identifier: self.rate_limiter.get_remaining_requests(identifier)
-                    for identifier in self.rate_limiter.requests.keys()
+                    for identifier in list(self.rate_limiter.requests)
                 },
                 'config': {
                     'max_file_size_gb': self.config.max_file_size_gb,
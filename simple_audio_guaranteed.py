@@ -6,6 +6,7 @@ This version prioritizes AUDIO INCLUSION above all else!
 
 from yt_dlp import YoutubeDL
 import os
+import time
 
 # Your playlist URL
 playlist_url = 'https://youtube.com/playlist?list=PLAVB8XcRx5WXhHTLHV4ZS3Zpiaq_nZnXj&si=aIf6i1-Ra8O2Y_G4'
@@ -53,15 +54,26 @@ def main():
     except Exception as e:
         print(f"\n❌ Error: {e}")
 
+# Wall-clock of the last progress line; yt-dlp fires the hook per HTTP
+# chunk, far faster than a terminal needs
+_last_print = [0.0]
+
 def progress_hook(d):
     """Simple progress display"""
     if d['status'] == 'finished':
         filename = os.path.basename(d['filename'])
         print(f"✅ Completed: {filename}")
     elif d['status'] == 'downloading':
-        if 'total_bytes' in d and d['total_bytes']:
-            percent = (d['downloaded_bytes'] / d['total_bytes']) * 100
-            print(f"\r📥 Downloading: {percent:.1f}%", end='', flush=True)
+        now = time.monotonic()
+        if now - _last_print[0] < 0.1:
+            return
+        _last_print[0] = now
+        total = d.get('total_bytes')
+        if total:
+            # Integer percent is plenty for a console line and skips
+            # the float divide/format
+            pct = (d['downloaded_bytes'] * 100) // total
+            print(f"\r📥 Downloading: {pct:3d}%", end='', flush=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,14 +2,18 @@
 Professional YouTube Downloader - Main Application Class
 """
 
+import itertools
+import json
 import os
+import queue
+import re
 import sys
 import signal
 import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
 import hashlib
 
@@ -17,7 +21,10 @@ from yt_dlp import YoutubeDL
 from yt_dlp.utils import DownloadError as YTDLPDownloadError
 
 # Import our custom modules
-from config import DownloadConfig, ConfigManager, setup_argument_parser, merge_args_with_config
+from config import (
+    DownloadConfig, ConfigManager, setup_argument_parser,
+    merge_args_with_config, config_to_dict
+)
 from logging_config import setup_global_logger, get_logger, YTDLPLogger
 from error_handling import (
     RetryManager, RetryConfig, ErrorClassifier, DownloadError,
@@ -26,6 +33,11 @@ from error_handling import (
 from progress_tracking import ProgressTracker, EmailNotifier, StatusReporter
 from database import DownloadDatabase, DownloadRecord, ResumeManager
 
+# Rate-limit strings like '500K' or '1.5M'; one match replaces the
+# chained endswith scans and upper() copies
+_RATE_RE = re.compile(r'^\s*([\d.]+)\s*([KMG]?)\s*$', re.IGNORECASE)
+_RATE_MULT = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
 
 class YouTubeDownloader:
     """Professional YouTube playlist downloader with all production features."""
@@ -34,6 +46,14 @@ class YouTubeDownloader:
         """Initialize the downloader with configuration."""
         self.config = config
         self.logger = get_logger(__name__)
+
+        # 0 (or negative) means auto-tune: downloads are I/O bound, so
+        # several workers per core pay off, but throughput plateaus
+        # around 30 connections
+        if config.concurrent_downloads <= 0:
+            config.concurrent_downloads = min(30, (os.cpu_count() or 4) * 4)
+            self.logger.info(
+                f"Auto-tuned concurrent downloads to {config.concurrent_downloads}")
         
         # Initialize components
         self.database = DownloadDatabase(config.database_path) if config.use_database else None
@@ -56,10 +76,60 @@ class YouTubeDownloader:
                 config.email_to
             )
         
-        # Thread pool for concurrent downloads
-        self.executor = ThreadPoolExecutor(max_workers=config.concurrent_downloads)
+        # Thread pool for concurrent downloads; workers are named for
+        # debuggability and, when pin_workers is enabled, pinned to
+        # cores where the platform allows. Pinning is opt-in because
+        # subprocesses spawned from a pinned worker (ffmpeg merges and
+        # postprocessing) inherit its one-CPU affinity mask
+        self._pin_counter = itertools.count()
+        self.executor = ThreadPoolExecutor(
+            max_workers=config.concurrent_downloads,
+            thread_name_prefix='ytdl-worker',
+            initializer=self._pin_worker if config.pin_workers else None)
+        # Final report serialization runs off the critical path here
+        self._report_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='report')
         self.active_downloads = {}
+        # Reverse index so progress hooks resolve a filename in O(1)
+        # instead of scanning every active download per tick
+        self._filename_to_id = {}
+        self._filename_lock = threading.Lock()
+        # Per-file debounce for progress events: yt-dlp fires the hook
+        # per buffer read, far more often than the trackers need
+        self._progress_min_interval = (
+            1.0 / config.progress_update_hz if config.progress_update_hz > 0 else 0.0)
+        self._last_progress_emit = {}
+        # Records known to be complete for this process's lifetime;
+        # set add/contains are GIL-atomic, so no lock. Retries and
+        # resubmissions skip the stat() and DB check entirely
+        self._already_done = set()
         self.session_id = None
+
+        # Output directory parsed into a Path exactly once; hot paths
+        # join against it instead of re-running Path() per call
+        self._output_path = Path(config.output_dir)
+        self._output_path.mkdir(parents=True, exist_ok=True)
+
+        # On-disk playlist metadata cache; repeated runs against the
+        # same playlist read a local JSON file instead of re-fetching
+        # every entry over the network
+        self._meta_cache_dir = self._output_path / '.meta_cache'
+
+        # Options are derived once from the (fixed) config; each worker
+        # thread keeps one YoutubeDL built from them instead of paying
+        # option validation and extractor setup per video
+        self._ytdl_opts = self._create_ytdl_opts()
+        # The yt-dlp naming template converted once to a str.format
+        # string; record creation then formats in a single pass instead
+        # of three replace() copies per entry
+        fmt = config.naming_template.replace('{', '{{').replace('}', '}}')
+        fmt = fmt.replace('%(title)s', '{title}')
+        fmt = fmt.replace('%(ext)s', '{ext}')
+        fmt = fmt.replace('%(playlist_index)03d', '{index:03d}')
+        self._filename_fmt = fmt
+        self._tls = threading.local()
+        self._ytdl_instances = []
+        self._ytdl_instances_lock = threading.Lock()
         
         # Setup signal handlers
         self._setup_signal_handlers()
@@ -67,8 +137,25 @@ class YouTubeDownloader:
         # Setup progress callbacks
         self._setup_progress_callbacks()
     
+    def _pin_worker(self):
+        """Pin the calling worker thread to one CPU where supported."""
+        if not hasattr(os, 'sched_setaffinity'):
+            return  # macOS/Windows have no thread-affinity API
+        try:
+            # next() on a count is a single C call, atomic under the GIL
+            cpu = next(self._pin_counter) % (os.cpu_count() or 1)
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            self.logger.debug(f"Could not pin worker thread: {e}")
+
     def _setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown."""
+        # signal.signal() raises when called off the main thread, which
+        # happens when the extension server builds a downloader on a
+        # worker thread; shutdown is the embedder's job there
+        if threading.current_thread() is not threading.main_thread():
+            return
+
         def signal_handler(signum, frame):
             self.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
             self.graceful_shutdown.request_shutdown()
@@ -87,11 +174,8 @@ class YouTubeDownloader:
     
     def _create_ytdl_opts(self) -> Dict[str, Any]:
         """Create yt-dlp options from configuration."""
-        output_path = Path(self.config.output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        
         opts = {
-            'outtmpl': str(output_path / self.config.naming_template),
+            'outtmpl': str(self._output_path / self.config.naming_template),
             'format': self._get_format_selector(),
             'merge_output_format': self.config.video_format,
             'writeinfojson': self.config.write_metadata,
@@ -111,12 +195,25 @@ class YouTubeDownloader:
             'postprocessor_hooks': [self._postprocessor_hook],
             'prefer_ffmpeg': True,  # Prefer ffmpeg for better audio handling
             'keepvideo': False,  # Don't keep separate video files
+            'socket_timeout': 30,  # Don't let a stalled connection hold a worker
         }
         
         # Rate limiting
         if self.config.rate_limit:
             opts['ratelimit'] = self._parse_rate_limit(self.config.rate_limit)
-        
+
+        # Multi-connection transfer: parallel byte-range requests avoid
+        # single-stream TCP slow start and per-connection server caps.
+        # Fragmented (HLS/DASH) formats use yt-dlp's own concurrency;
+        # aria2c covers plain HTTP downloads when available
+        opts['concurrent_fragment_downloads'] = self.config.range_connections or 4
+        if self.config.use_aria2:
+            connections = str(self.config.range_connections or 8)
+            opts['external_downloader'] = 'aria2c'
+            opts['external_downloader_args'] = {
+                'aria2c': ['-x', connections, '-s', connections, '-k', '1M']
+            }
+
         return opts
     
     def _get_format_selector(self) -> str:
@@ -133,20 +230,26 @@ class YouTubeDownloader:
     
     def _parse_rate_limit(self, rate_limit: str) -> int:
         """Parse rate limit string to bytes per second."""
-        rate_limit = rate_limit.upper()
-        if rate_limit.endswith('K'):
-            return int(float(rate_limit[:-1]) * 1024)
-        elif rate_limit.endswith('M'):
-            return int(float(rate_limit[:-1]) * 1024 * 1024)
-        elif rate_limit.endswith('G'):
-            return int(float(rate_limit[:-1]) * 1024 * 1024 * 1024)
-        else:
-            return int(rate_limit)
+        match = _RATE_RE.match(rate_limit)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {rate_limit!r}")
+        return int(float(match.group(1)) * _RATE_MULT[match.group(2).upper()])
     
     def _progress_hook(self, d: Dict[str, Any]):
         """Handle yt-dlp progress updates."""
         if d['status'] == 'downloading':
             filename = d.get('filename', 'unknown')
+
+            # Drop over-frequent ticks before doing any lookups at all;
+            # updates carry absolute byte counts, so skipped ones lose
+            # nothing. Keyed by filename since that is what the event
+            # gives us for free. Terminal events bypass this entirely
+            if self._progress_min_interval:
+                now = time.monotonic()
+                if now - self._last_progress_emit.get(filename, 0.0) < self._progress_min_interval:
+                    return
+                self._last_progress_emit[filename] = now
+
             total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
             downloaded_bytes = d.get('downloaded_bytes', 0)
             speed = d.get('speed', 0)
@@ -155,14 +258,14 @@ class YouTubeDownloader:
             # Find the download ID for this filename
             download_id = self._get_download_id_by_filename(filename)
             if download_id:
-                self.progress_tracker.update_progress(
-                    download_id,
-                    filename=filename,
-                    total_bytes=total_bytes,
-                    downloaded_bytes=downloaded_bytes,
-                    speed=speed or 0,
-                    eta=eta,
-                    status='downloading'
+                # Filename only needs recording once; the per-chunk
+                # updates go through the dedicated fast path
+                stats = self.progress_tracker.downloads.get(download_id)
+                if stats is not None and stats.filename != filename:
+                    self.progress_tracker.update_progress(download_id, filename=filename)
+                self.progress_tracker.update_from_ytdlp(
+                    download_id, downloaded_bytes, total_bytes,
+                    speed or 0, eta, 'downloading'
                 )
                 
                 # Update database
@@ -176,15 +279,13 @@ class YouTubeDownloader:
             download_id = self._get_download_id_by_filename(filename)
             
             if download_id:
-                file_size = Path(filename).stat().st_size if Path(filename).exists() else 0
-                
                 self.progress_tracker.complete_download(download_id, success=True)
                 
                 # Update database
                 if self.database:
                     self.database.update_download_status(download_id, 'completed')
                 
-                self.logger.info(f"Successfully downloaded: {Path(filename).name}")
+                self.logger.info(f"Successfully downloaded: {os.path.basename(filename)}")
     
     def _postprocessor_hook(self, d: Dict[str, Any]):
         """Handle yt-dlp post-processor updates."""
@@ -193,72 +294,135 @@ class YouTubeDownloader:
     
     def _get_download_id_by_filename(self, filename: str) -> Optional[str]:
         """Get download ID by matching filename pattern."""
-        # This is a simplified approach - in production you might want a more robust mapping
+        # Exact and basename hits are dict lookups; the substring scan
+        # only runs when yt-dlp reports a name we have not seen yet
+        # (e.g. intermediate .fNNN fragment files)
+        index = self._filename_to_id
+        download_id = index.get(filename) or index.get(os.path.basename(filename))
+        if download_id:
+            return download_id
+
         for download_id, info in self.active_downloads.items():
             if info.get('filename') and info['filename'] in filename:
+                # Memoize so the next tick for this name is O(1)
+                with self._filename_lock:
+                    self._filename_to_id[filename] = download_id
                 return download_id
         return None
     
+    def _meta_cache_file(self, playlist_url: str) -> Path:
+        """Cache file path for a playlist URL."""
+        key = hashlib.md5(playlist_url.encode()).hexdigest()
+        return self._meta_cache_dir / f"{key}.json"
+
+    def _load_cached_playlist_info(self, playlist_url: str) -> Optional[Dict[str, Any]]:
+        """Return cached playlist metadata if present and fresh."""
+        if self.config.refresh_metadata:
+            return None
+
+        cache_file = self._meta_cache_file(playlist_url)
+        try:
+            if time.time() - cache_file.stat().st_mtime < self.config.metadata_cache_ttl:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable metadata cache: {e}")
+        return None
+
+    def _store_cached_playlist_info(self, playlist_url: str, info: Dict[str, Any]):
+        """Write playlist metadata to the cache; failures are non-fatal."""
+        cache_file = self._meta_cache_file(playlist_url)
+        try:
+            self._meta_cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(info, f, default=str)
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"Could not cache playlist metadata: {e}")
+
+    def _get_thread_ytdl(self) -> YoutubeDL:
+        """Return this thread's YoutubeDL, creating it on first use."""
+        ydl = getattr(self._tls, 'ydl', None)
+        if ydl is None:
+            ydl = YoutubeDL(self._ytdl_opts)
+            self._tls.ydl = ydl
+            with self._ytdl_instances_lock:
+                self._ytdl_instances.append(ydl)
+        return ydl
+
     def _extract_playlist_info(self, playlist_url: str) -> Dict[str, Any]:
         """Extract playlist information without downloading."""
-        opts = self._create_ytdl_opts()
+        cached = self._load_cached_playlist_info(playlist_url)
+        if cached is not None:
+            self.logger.info("Using cached playlist metadata")
+            return cached
+
+        opts = dict(self._ytdl_opts)
         opts.update({
             'extract_flat': True,  # Only extract metadata
             'quiet': True
         })
-        
+
         try:
             with YoutubeDL(opts) as ydl:
                 info = ydl.extract_info(playlist_url, download=False)
-                return info
         except Exception as e:
             error = ErrorClassifier.classify_ytdlp_error(str(e), playlist_url)
             self.logger.error(f"Failed to extract playlist info: {error}")
             raise error
+
+        if info:
+            self._store_cached_playlist_info(playlist_url, info)
+        return info
     
-    def _create_download_records(self, playlist_info: Dict[str, Any]) -> List[DownloadRecord]:
-        """Create download records from playlist information."""
-        records = []
+    def _create_download_records(self, playlist_info: Dict[str, Any]) -> Iterator[DownloadRecord]:
+        """Yield download records from playlist information."""
         playlist_url = playlist_info.get('webpage_url', '')
-        
-        for entry in playlist_info.get('entries', []):
+        # Hoisted out of the loop: attribute lookups cost per iteration
+        filename_fmt = self._filename_fmt
+        video_format = self.config.video_format
+        max_quality = self.config.max_quality
+        # The playlist-URL prefix is hashed once; per entry a cheap
+        # copy() of the small blake2b state replaces re-encoding and
+        # re-hashing the same prefix thousands of times
+        prehash = hashlib.blake2b(f"{playlist_url}:".encode(), digest_size=8)
+
+        for index, entry in enumerate(playlist_info.get('entries') or (), 1):
             if not entry:
                 continue
-            
+
             video_id = entry.get('id', '')
             video_url = entry.get('url', f"https://youtube.com/watch?v={video_id}")
             title = entry.get('title', 'Unknown Title')
-            
-            # Generate filename
-            filename = self.config.naming_template.replace('%(title)s', title)
-            filename = filename.replace('%(ext)s', self.config.video_format)
-            filename = filename.replace('%(playlist_index)03d', f"{len(records) + 1:03d}")
-            
+
             # Create download record
-            download_id = self._generate_download_id(playlist_url, video_id)
-            record = DownloadRecord(
+            id_hash = prehash.copy()
+            id_hash.update(video_id.encode())
+            download_id = id_hash.hexdigest()
+            yield DownloadRecord(
                 id=download_id,
                 playlist_url=playlist_url,
                 video_url=video_url,
                 video_id=video_id,
                 title=title,
-                filename=filename,
+                filename=filename_fmt.format(title=title, ext=video_format, index=index),
                 status='pending',
-                quality=self.config.max_quality,
-                format=self.config.video_format
+                quality=max_quality,
+                format=video_format
             )
-            
-            records.append(record)
-        
-        return records
-    
-    def _generate_download_id(self, playlist_url: str, video_id: str) -> str:
-        """Generate a unique download ID."""
-        return hashlib.md5(f"{playlist_url}:{video_id}".encode()).hexdigest()[:16]
     
     @with_retry()
     def _download_single_video(self, record: DownloadRecord) -> bool:
         """Download a single video with retry logic."""
+        if record.id in self._already_done:
+            # Keep stats consistent with the slow skip path below
+            self.progress_tracker.add_download(record.id, record.video_url)
+            self.progress_tracker.complete_download(record.id, success=True)
+            return True
+
         if not self.circuit_breaker.can_execute():
             raise DownloadError("Circuit breaker is open - too many failures")
         
@@ -272,26 +436,29 @@ class YouTubeDownloader:
             # Add to progress tracker
             self.progress_tracker.add_download(record.id, record.video_url)
             self.active_downloads[record.id] = {'filename': record.filename}
+            with self._filename_lock:
+                self._filename_to_id[record.filename] = record.id
             
             # Update database status
             if self.database:
                 self.database.update_download_status(record.id, 'downloading')
             
             # Check if already downloaded
-            output_path = Path(self.config.output_dir) / record.filename
-            if output_path.exists() and self.database:
-                if self.database.is_video_downloaded(record.playlist_url, record.video_id):
+            output_path = self._output_path / record.filename
+            if output_path.exists() and self.resume_manager:
+                if self.resume_manager.is_downloaded(record.playlist_url, record.video_id):
                     self.logger.info(f"Skipping already downloaded: {record.title}")
+                    self._already_done.add(record.id)
                     self.progress_tracker.complete_download(record.id, success=True)
                     return True
             
-            # Perform download
-            opts = self._create_ytdl_opts()
-            with YoutubeDL(opts) as ydl:
-                ydl.download([record.video_url])
+            # Perform download with this worker's reused instance
+            ydl = self._get_thread_ytdl()
+            ydl.download([record.video_url])
             
             # Record success
             self.circuit_breaker.record_success()
+            self._already_done.add(record.id)
             return True
             
         except Exception as e:
@@ -311,7 +478,77 @@ class YouTubeDownloader:
             # Cleanup
             self.graceful_shutdown.unregister_download(record.id)
             self.active_downloads.pop(record.id, None)
+            with self._filename_lock:
+                self._filename_to_id = {
+                    name: did for name, did in self._filename_to_id.items()
+                    if did != record.id
+                }
     
+    def _run_downloads(self, records) -> tuple:
+        """Run records through the shared pool with a bounded window.
+
+        A producer thread submits work gated by a semaphore sized at
+        twice the worker count, so a huge playlist keeps at most a
+        window of futures alive instead of materializing one per video
+        up front. Returns (success_count, failed_count).
+        """
+        completions: queue.Queue = queue.Queue()
+        window = threading.Semaphore(self.config.concurrent_downloads * 2)
+        submitted = [0]
+        producer_done = threading.Event()
+
+        def produce():
+            count = 0
+            try:
+                for record in records:
+                    if self.graceful_shutdown.is_shutdown_requested():
+                        break
+                    window.acquire()
+                    future = self.executor.submit(self._download_single_video, record)
+                    count += 1
+
+                    def _done(fut, rec=record):
+                        window.release()
+                        completions.put((rec, fut))
+
+                    future.add_done_callback(_done)
+            finally:
+                submitted[0] = count
+                producer_done.set()
+
+        threading.Thread(target=produce, daemon=True, name='submit').start()
+
+        success_count = 0
+        failed_count = 0
+        processed = 0
+        while not (producer_done.is_set() and processed >= submitted[0]):
+            try:
+                record, future = completions.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            processed += 1
+
+            if self.graceful_shutdown.is_shutdown_requested():
+                self.logger.info("Cancelling remaining downloads due to shutdown request")
+                break
+
+            try:
+                if future.result():
+                    success_count += 1
+                else:
+                    failed_count += 1
+            except Exception as e:
+                failed_count += 1
+                self.logger.error(f"Download failed for {record.title}: {e}")
+
+            # Update session stats
+            if self.database and self.session_id:
+                self.database.update_session_stats(
+                    self.session_id, success_count, failed_count
+                )
+
+        return success_count, failed_count
+
     def download_playlist(self, playlist_url: str, resume: bool = False) -> bool:
         """Download an entire playlist with all production features."""
         try:
@@ -331,66 +568,58 @@ class YouTubeDownloader:
             
             self.logger.info(f"Playlist: {playlist_title} ({video_count} videos)")
             
-            # Create download records
+            # Records are produced lazily; without a database the first
+            # download starts before the last entry is even built. With
+            # one, the list must materialize so the bulk insert lands
+            # before any download can update its row
             download_records = self._create_download_records(playlist_info)
-            
+
             # Add to database
             if self.database:
+                download_records = list(download_records)
                 self.database.add_playlist(
                     playlist_url, playlist_title, 
                     playlist_info.get('description', ''), video_count
                 )
                 
                 self.session_id = self.database.create_download_session(
-                    playlist_url, video_count, self.config.__dict__
+                    playlist_url, video_count, config_to_dict(self.config)
                 )
-                
-                # Add download records to database
-                for record in download_records:
-                    self.database.add_download(record)
+
+                # One bulk query answers every already-completed check
+                # up front; must run before the bulk insert below, which
+                # rewrites the rows with status 'pending'
+                completed_ids = self.database.load_completed_set(playlist_url)
+                if completed_ids:
+                    self._already_done.update(
+                        record.id for record in download_records
+                        if record.video_id in completed_ids)
+
+                # Add download records to database in one transaction,
+                # leaving known-complete rows untouched so they keep
+                # their 'completed' status
+                self.database.add_downloads_bulk(
+                    [record for record in download_records
+                     if record.id not in self._already_done])
             
             # Send start notification
             if self.email_notifier:
                 self.email_notifier.notify_download_started(playlist_url, video_count)
             
             # Download videos concurrently
-            success_count = 0
-            failed_count = 0
-            
-            with ThreadPoolExecutor(max_workers=self.config.concurrent_downloads) as executor:
-                # Submit all download tasks
-                future_to_record = {
-                    executor.submit(self._download_single_video, record): record
-                    for record in download_records
-                }
-                
-                # Process completed downloads
-                for future in as_completed(future_to_record):
-                    if self.graceful_shutdown.is_shutdown_requested():
-                        self.logger.info("Cancelling remaining downloads due to shutdown request")
-                        break
-                    
-                    record = future_to_record[future]
-                    try:
-                        success = future.result()
-                        if success:
-                            success_count += 1
-                        else:
-                            failed_count += 1
-                    except Exception as e:
-                        failed_count += 1
-                        self.logger.error(f"Download failed for {record.title}: {e}")
-                    
-                    # Update session stats
-                    if self.database and self.session_id:
-                        self.database.update_session_stats(
-                            self.session_id, success_count, failed_count
-                        )
+            success_count, failed_count = self._run_downloads(download_records)
             
-            # Generate final report
+            # Generate final report in the background; it overlaps the
+            # email/database wrap-up below and is joined in cleanup()
             overall_stats = self.progress_tracker.get_overall_stats()
-            self.status_reporter.save_report(self.progress_tracker.downloads)
-            self.status_reporter.save_html_report(self.progress_tracker.downloads)
+            # Same version for both saves, so the aggregation walk runs once
+            report_version = self.progress_tracker._version
+            self._report_executor.submit(
+                self.status_reporter.save_report,
+                self.progress_tracker.downloads, version=report_version)
+            self._report_executor.submit(
+                self.status_reporter.save_html_report,
+                self.progress_tracker.downloads, version=report_version)
             
             # Complete session
             if self.database and self.session_id:
@@ -420,7 +649,9 @@ class YouTubeDownloader:
             return False
         
         finally:
-            self.cleanup()
+            # Only the fast half on the way out; the caller runs the
+            # pool joins after the final result is reported
+            self._fast_cleanup()
     
     def _resume_playlist_download(self, playlist_url: str, resume_info: Dict[str, Any]) -> bool:
         """Resume an interrupted playlist download."""
@@ -432,32 +663,11 @@ class YouTubeDownloader:
         # Create session
         if self.database:
             self.session_id = self.database.create_download_session(
-                playlist_url, len(incomplete_records), self.config.__dict__
+                playlist_url, len(incomplete_records), config_to_dict(self.config)
             )
         
-        success_count = 0
-        failed_count = 0
-        
-        # Download remaining videos
-        with ThreadPoolExecutor(max_workers=self.config.concurrent_downloads) as executor:
-            future_to_record = {
-                executor.submit(self._download_single_video, record): record
-                for record in incomplete_records
-            }
-            
-            for future in as_completed(future_to_record):
-                if self.graceful_shutdown.is_shutdown_requested():
-                    break
-                
-                record = future_to_record[future]
-                try:
-                    success = future.result()
-                    if success:
-                        success_count += 1
-                    else:
-                        failed_count += 1
-                except Exception as e:
-                    failed_count += 1
+        # Download remaining videos on the shared pool
+        success_count, failed_count = self._run_downloads(incomplete_records)
         
         # Complete session
         if self.database and self.session_id:
@@ -469,7 +679,7 @@ class YouTubeDownloader:
     
     def list_formats(self, url: str) -> List[Dict[str, Any]]:
         """List available formats for a video or playlist."""
-        opts = self._create_ytdl_opts()
+        opts = dict(self._ytdl_opts)
         opts.update({
             'listformats': True,
             'quiet': True
@@ -483,17 +693,53 @@ class YouTubeDownloader:
             self.logger.error(f"Failed to list formats: {e}")
             return []
     
-    def cleanup(self):
-        """Clean up resources."""
+    def _fast_cleanup(self):
+        """Release user-facing resources; cheap on the happy path.
+
+        Runs in download_playlist's finally block so the terminal is
+        usable and notifications are flushed as soon as the summary is
+        logged, without waiting on worker-pool joins.
+        """
         self.progress_tracker.cleanup()
-        
+
+        # Flush queued notifications here rather than waiting for the
+        # atexit hook; close() is idempotent and bounded by its join
+        # timeout, so a hung SMTP server cannot stall shutdown
+        if self.email_notifier:
+            self.email_notifier.close()
+
+    def _slow_cleanup(self):
+        """Join worker pools and release remaining resources."""
         if self.executor:
-            self.executor.shutdown(wait=True)
-        
+            # The user has already seen the summary by now; cancel
+            # queued work instead of running it to completion
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+        # Let any in-flight report writes finish
+        self._report_executor.shutdown(wait=True)
+
+        with self._ytdl_instances_lock:
+            instances, self._ytdl_instances = self._ytdl_instances, []
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing YoutubeDL instance: {e}")
+
+        # Closed only after the pool joins, so no worker can hit a
+        # closed connection mid-write
+        if self.database:
+            self.database.close()
+
         # Wait for graceful shutdown
         if self.graceful_shutdown.is_shutdown_requested():
             self.graceful_shutdown.wait_for_completion()
 
+    def cleanup(self):
+        """Clean up resources."""
+        self._fast_cleanup()
+        self._slow_cleanup()
+
 
 def main():
     """Main entry point for the application."""
@@ -542,7 +788,10 @@ def main():
         
         # Start download
         success = downloader.download_playlist(args.url, resume=args.resume)
-        
+
+        logger.info(f"Exit status: {'success' if success else 'failure'}")
+        downloader._slow_cleanup()
+
         return 0 if success else 1
         
     except KeyboardInterrupt: